@@ -1,12 +1,15 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 from pathlib import Path
+import os
+import re
 import sys
+import threading
+import uuid
 
 sys.path.append(str(Path(__file__).parent))
-from core.cleaner import DataCleaner
-from core.analyzer import DataAnalyzer
+# pandas, plotly and the analysis modules are imported by the pages that use them
+from core.profiling import profiler
+from core.memory import MemoryGovernor, MemoryBudgetError, LOAD_EXPANSION, EXCEL_LOAD_EXPANSION
 
 # Page config
 st.set_page_config(
@@ -16,150 +19,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS with responsive design
-st.markdown("""
-<style>
-    /* Base styles */
-    .main-header {
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(120deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 0.5rem;
-    }
-    
-    .stButton>button {
-        width: 100%;
-        background: linear-gradient(120deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.5rem 1rem;
-        border-radius: 5px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton>button:hover {
-        opacity: 0.9;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Tablet styles (768px - 1024px) */
-    @media (max-width: 1024px) and (min-width: 768px) {
-        .main-header {
-            font-size: 2.5rem;
-        }
-        
-        .block-container {
-            padding: 2rem 1rem;
-        }
-        
-        [data-testid="stSidebar"] {
-            width: 250px;
-        }
-        
-        .stMetric {
-            font-size: 0.9rem;
-        }
-    }
-    
-    /* Mobile styles (max 767px) */
-    @media (max-width: 767px) {
-        .main-header {
-            font-size: 1.8rem;
-            text-align: center;
-        }
-        
-        .block-container {
-            padding: 1rem 0.5rem;
-        }
-        
-        [data-testid="stSidebar"] {
-            width: 100%;
-        }
-        
-        .stMetric {
-            font-size: 0.85rem;
-        }
-        
-        .stMetric label {
-            font-size: 0.75rem;
-        }
-        
-        .stButton>button {
-            padding: 0.75rem 1rem;
-            font-size: 0.9rem;
-        }
-        
-        /* Stack columns on mobile */
-        [data-testid="column"] {
-            width: 100% !important;
-            flex: 1 1 100% !important;
-            min-width: 100% !important;
-        }
-        
-        /* Better spacing for mobile */
-        .element-container {
-            margin-bottom: 0.5rem;
-        }
-        
-        /* Adjust dataframe for mobile */
-        .stDataFrame {
-            font-size: 0.75rem;
-        }
-        
-        /* Radio buttons horizontal on mobile */
-        .stRadio > div {
-            flex-direction: column;
-        }
-    }
-    
-    /* Desktop large screens (1440px+) */
-    @media (min-width: 1440px) {
-        .block-container {
-            max-width: 1400px;
-            padding: 3rem 2rem;
-        }
-        
-        .main-header {
-            font-size: 3.5rem;
-        }
-    }
-    
-    /* Touch-friendly improvements */
-    @media (hover: none) and (pointer: coarse) {
-        .stButton>button {
-            padding: 0.75rem 1.5rem;
-            min-height: 44px;
-        }
-        
-        .stCheckbox {
-            min-height: 44px;
-        }
-        
-        .stRadio label {
-            padding: 0.5rem;
-        }
-    }
-    
-    /* Smooth transitions */
-    * {
-        transition: all 0.2s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS with responsive design, read and minified once per process
+@st.cache_resource
+def load_css():
+    css = (Path(__file__).parent / 'assets' / 'style.css').read_text(encoding='utf-8')
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    return re.sub(r'\s+', ' ', css).strip()
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+@st.cache_resource
+def get_governor():
+    """One memory governor shared by every session of this process"""
+    return MemoryGovernor.from_env()
 
 # Initialize session state
-if 'df' not in st.session_state:
-    st.session_state.df = None
-if 'cleaned_df' not in st.session_state:
-    st.session_state.cleaned_df = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 if 'issues' not in st.session_state:
     st.session_state.issues = []
 if 'recommendations' not in st.session_state:
     st.session_state.recommendations = {}
+if 'lineage' not in st.session_state:
+    st.session_state.lineage = None
+
+@st.cache_resource
+def start_metrics_server():
+    """Serve Prometheus metrics once per process if DATA_APP_METRICS_PORT is set"""
+    port = os.environ.get('DATA_APP_METRICS_PORT')
+    return profiler.serve_metrics(int(port)) if port else None
+
+start_metrics_server()
+
+# Dataframes live with the memory governor, which may spill them to disk
+governor = get_governor()
+frames = governor.session(st.session_state.session_id)
+
+def working_frame():
+    """The rows picked on the Filter page, or the whole upload"""
+    subset = frames.get('subset')
+    return subset if subset is not None else frames['df']
 
 # Header with responsive subtitle
 st.markdown('<h1 class="main-header"><span style="-webkit-text-fill-color: initial;">🧹</span> Data Cleaner</h1>', unsafe_allow_html=True)
@@ -172,22 +71,38 @@ with st.sidebar:
     # Use tabs for better mobile experience
     page = st.radio(
         "Choose a step:",
-        ["📤 Upload Data", "🔍 Analyze", "🧹 Clean", "📊 Results", "💾 Export"],
+        ["📤 Upload Data", "🔎 Filter", "🔍 Analyze", "🧹 Clean", "📊 Results", "💾 Export"],
         label_visibility="collapsed"
     )
     
     st.divider()
     
     # Progress indicator
-    steps = ["📤 Upload Data", "🔍 Analyze", "🧹 Clean", "📊 Results", "💾 Export"]
+    steps = ["📤 Upload Data", "🔎 Filter", "🔍 Analyze", "🧹 Clean", "📊 Results", "💾 Export"]
     current_step = steps.index(page) + 1
     st.progress(current_step / len(steps))
     st.caption(f"Step {current_step} of {len(steps)}")
+    st.caption(f"Memory: {governor.session_usage(frames.session_id) / 1024**2:,.0f} MB "
+               f"of {governor.session_budget / 1024**2:,.0f} MB")
+    # Filled in at the end of the run, after the Filter page has applied its changes
+    filter_status = st.empty()
+    
+    show_performance = st.checkbox("⚡ Performance", help="Time every analysis and cleaning step")
+    trace_memory = show_performance and st.checkbox(
+        "Trace peak memory",
+        help="Also record peak memory per step. Traced steps run slower and take turns with other sessions"
+    )
     
     st.divider()
     st.caption("Made with ❤️ using Streamlit")
     st.caption("📱 Optimized for all devices")
 
+# Record analyzer and cleaner calls of this run for the Performance panel
+if show_performance:
+    profiler.start_capture(memory=trace_memory)
+else:
+    profiler.stop_capture()
+
 # Page: Upload Data
 if page == "📤 Upload Data":
     st.header("📤 Upload Your Data")
@@ -199,23 +114,87 @@ if page == "📤 Upload Data":
         cols = st.columns([2, 1])
     
     with cols[0]:
-        uploaded_file = st.file_uploader(
-            "Drop your CSV or Excel file here",
+        multi = st.toggle(
+            "Combine multiple files",
+            help="Stack daily or monthly shards of one feed into a single dataset"
+        )
+        uploaded_files = st.file_uploader(
+            "Drop your CSV or Excel files here" if multi else "Drop your CSV or Excel file here",
             type=['csv', 'xlsx', 'xls'],
-            help="Supported formats: CSV, Excel"
+            accept_multiple_files=multi,
+            help="Supported formats: CSV, Excel",
+            key=f"uploader_{multi}"
         )
+        if not isinstance(uploaded_files, list):
+            uploaded_files = [uploaded_files] if uploaded_files else []
         
-        if uploaded_file:
+        if uploaded_files:
+            from core.loader import is_excel, list_sheets, load_file
+            from core.ingest import ingest_uploads, common_name, SOURCE_COLUMN
+            from core.analyzer import DataAnalyzer
+            
             try:
-                with st.spinner("Loading and analyzing file..."):
-                    if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file)
-                    else:
-                        df = pd.read_excel(uploaded_file)
+                if len(uploaded_files) > 1:
+                    # Columns are matched by normalized name and widened to a common type
+                    add_source = st.checkbox(
+                        f"Add a '{SOURCE_COLUMN}' column",
+                        value=True,
+                        help="Records which file each row came from"
+                    )
+                    load_key = (tuple((f.file_id, f.name, f.size) for f in uploaded_files), add_source)
+                else:
+                    uploaded_file = uploaded_files[0]
+                    sheet = None
+                    expansion = LOAD_EXPANSION
+                    if is_excel(uploaded_file.name):
+                        expansion = EXCEL_LOAD_EXPANSION
+                        sheets = list_sheets(uploaded_file)
+                        if len(sheets) > 1:
+                            sheet = st.selectbox("Sheet:", sheets)
+                    load_key = (((uploaded_file.file_id, uploaded_file.name, uploaded_file.size),), sheet)
                 
-                st.session_state.df = df
+                if st.session_state.get('load_key') == load_key and 'df' in frames:
+                    # Same upload as the last run: keep its data, index, filters and cleaning results
+                    df = frames['df']
+                    shards = st.session_state.get('shards')
+                else:
+                    # Drop the previous data and everything derived from it first, so it
+                    # is neither budgeted against the new upload nor left behind if it fails
+                    for key in ('df', 'subset', 'cleaned_df', 'frame_index'):
+                        frames.pop(key)
+                    st.session_state.load_key = None
+                    st.session_state.lineage = None
+                    st.session_state.snapshot = None
+                    st.session_state.associations = {}
+                    st.session_state.filters = []
+                    st.session_state.shards = None
+                    
+                    shards = None
+                    if len(uploaded_files) > 1:
+                        names = [f.name for f in uploaded_files]
+                        expansion = EXCEL_LOAD_EXPANSION if any(is_excel(n) for n in names) else LOAD_EXPANSION
+                        with st.spinner(f"Loading and combining {len(uploaded_files)} files..."):
+                            governor.check_load(frames.session_id, sum(f.size for f in uploaded_files), expansion)
+                            df, shards = ingest_uploads(uploaded_files, source_column=SOURCE_COLUMN if add_source else None)
+                        source_name = common_name(names)
+                    else:
+                        with st.spinner("Loading and analyzing file..."):
+                            governor.check_load(frames.session_id, uploaded_file.size, expansion)
+                            df = load_file(uploaded_file, uploaded_file.name, sheet)
+                        source_name = Path(uploaded_file.name).stem
+                    
+                    frames['df'] = df
+                    st.session_state.source_name = source_name
+                    st.session_state.shards = shards
+                    
+                    # Index the columns once per dataset so filters answer without scanning rows
+                    from core.subset import FrameIndex
+                    with st.spinner("Indexing columns..."):
+                        frames['frame_index'] = FrameIndex(df)
+                    st.session_state.load_key = load_key
                 
                 # Auto-detect issues
+                governor.plan(frames.session_id, df, 'analyze')
                 analyzer = DataAnalyzer(df)
                 issues, recommendations = analyzer.auto_detect_issues()
                 quality_score = analyzer.get_data_quality_score()
@@ -225,6 +204,10 @@ if page == "📤 Upload Data":
                 
                 st.success(f"✅ Loaded {len(df):,} rows and {len(df.columns)} columns")
                 
+                if shards is not None:
+                    with st.expander(f"🧩 Files ({len(shards)})", expanded=False):
+                        st.dataframe(shards, use_container_width=True, hide_index=True)
+                
                 # Show quality score
                 col_score1, col_score2, col_score3 = st.columns([1, 2, 1])
                 with col_score2:
@@ -284,14 +267,120 @@ if page == "📤 Upload Data":
             - First row should be headers
             """)
 
+# Page: Filter
+elif page == "🔎 Filter":
+    st.header("🔎 Filter Rows")
+    
+    if frames.get('df') is None:
+        st.warning("⚠️ Please upload data first!")
+    else:
+        import time
+        import pandas as pd
+        from core.subset import FrameIndex
+        
+        df = frames['df']
+        index = frames.get('frame_index')
+        if index is None or not index.matches(df):
+            # Normally built on upload; only data set some other way gets here
+            frames.pop('frame_index')
+            with st.spinner("Indexing columns..."):
+                index = FrameIndex(df)
+            frames['frame_index'] = index
+        
+        st.caption("Keep only the rows you need. Analyze, Clean and Results then work on the matching rows.")
+        saved = {column: (op, value) for column, op, value in st.session_state.get('filters', [])}
+        filter_columns = st.multiselect(
+            "Filter by:",
+            list(index.columns),
+            default=[c for c in saved if c in index.columns]
+        )
+        
+        predicates = []
+        for col in filter_columns:
+            column_index = index.columns[col]
+            op, value = saved.get(col, (None, None))
+            if column_index.kind == 'sorted':
+                if column_index.min is None or column_index.min == column_index.max:
+                    st.caption(f"{col}: only one value, nothing to filter")
+                    continue
+                if pd.api.types.is_datetime64_any_dtype(df[col]):
+                    bounds = (pd.Timestamp(column_index.min).to_pydatetime(),
+                              pd.Timestamp(column_index.max).to_pydatetime())
+                elif pd.api.types.is_integer_dtype(df[col]):
+                    bounds = (int(column_index.min), int(column_index.max))
+                else:
+                    bounds = (float(column_index.min), float(column_index.max))
+                chosen = st.slider(col, bounds[0], bounds[1], value if op == 'between' else bounds)
+                # The full range keeps missing values too
+                if tuple(chosen) != bounds:
+                    predicates.append((col, 'between', tuple(chosen)))
+            elif column_index.kind == 'codes':
+                # Too many values to list; they are typed and looked up in the index
+                typed = st.text_area(
+                    f"{col} ({len(column_index.values):,} distinct values)",
+                    "\n".join(map(str, value or [])),
+                    placeholder="Any value; or one value per line",
+                    height=80
+                )
+                chosen = [line.strip() for line in typed.splitlines() if line.strip()]
+                if chosen:
+                    predicates.append((col, 'in', chosen))
+            else:
+                chosen = st.multiselect(
+                    col,
+                    list(column_index.values),
+                    default=[v for v in (value or []) if v in column_index.values],
+                    placeholder="Any value"
+                )
+                if chosen:
+                    predicates.append((col, 'in', chosen))
+        
+        start = time.perf_counter()
+        subset = index.select(df, predicates)
+        elapsed = time.perf_counter() - start
+        
+        if predicates != st.session_state.get('filters', []):
+            st.session_state.filters = predicates
+            if subset is df:
+                frames.pop('subset')
+            else:
+                frames['subset'] = subset
+            # Results compare against the rows that were cleaned
+            frames.pop('cleaned_df')
+            st.session_state.lineage = None
+            st.session_state.snapshot = None
+            st.session_state.associations = {}
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Matching Rows", f"{len(subset):,}")
+        with col2:
+            st.metric("Share of Rows", f"{len(subset) / max(len(df), 1):.1%}")
+        with col3:
+            st.metric("Filter Time", f"{elapsed * 1000:,.1f} ms")
+        
+        if len(subset) == 0:
+            st.warning("⚠️ No rows match every condition")
+        
+        with st.expander("👀 Preview Matching Rows", expanded=False):
+            st.dataframe(subset.head(10), use_container_width=True, height=300)
+        
+        with st.expander("🗂️ Column Indexes", expanded=False):
+            st.dataframe(index.describe(), use_container_width=True, hide_index=True)
+
 # Page: Analyze
 elif page == "🔍 Analyze":
     st.header("🔍 Data Analysis")
     
-    if st.session_state.df is None:
+    if frames.get('df') is None:
         st.warning("⚠️ Please upload data first!")
     else:
-        df = st.session_state.df
+        import pandas as pd
+        import plotly.express as px
+        from core.analyzer import DataAnalyzer
+        from core.charts import ChartData
+        
+        df = working_frame()
         analyzer = DataAnalyzer(df)
         
         # Overview metrics
@@ -368,6 +457,124 @@ elif page == "🔍 Analyze":
                 fig.update_layout(height=400)
                 st.plotly_chart(fig, use_container_width=True)
         
+        # Per-column distribution, aggregated here so only summaries reach the browser
+        chart_data = ChartData(df)
+        chart_height = 300 if st.session_state.get('compact_mode', False) else 400
+        
+        st.subheader("Column Distribution")
+        dist_col = st.selectbox("Column:", df.columns, key="dist_col")
+        series = df[dist_col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            hist = chart_data.histogram(dist_col)
+            fig = px.bar(hist, x='bin_start', y='count', labels={'bin_start': dist_col})
+            fig.update_layout(bargap=0, height=chart_height)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            if pd.api.types.is_numeric_dtype(series):
+                line = chart_data.downsample_line(dist_col)
+                fig = px.line(line, x='row', y=dist_col)
+                fig.update_layout(height=chart_height)
+                st.caption(f"{dist_col} by row (downsampled to {len(line):,} points)")
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            counts = chart_data.category_counts(dist_col)
+            fig = px.bar(counts, x='value', y='count', labels={'value': dist_col})
+            fig.update_layout(height=chart_height)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        numeric_cols = df.select_dtypes(include='number').columns
+        if len(numeric_cols) >= 2:
+            with st.expander("🔥 Relationship Between Two Columns"):
+                x_col = st.selectbox("X axis:", numeric_cols, index=0, key="heat_x")
+                y_col = st.selectbox("Y axis:", numeric_cols, index=1, key="heat_y")
+                grid = chart_data.heatmap(x_col, y_col)
+                fig = px.imshow(
+                    grid,
+                    origin='lower',
+                    aspect='auto',
+                    labels={'x': x_col, 'y': y_col, 'color': 'Rows'},
+                    color_continuous_scale='Blues'
+                )
+                fig.update_layout(height=chart_height)
+                st.plotly_chart(fig, use_container_width=True)
+        
+        if missing_pct > 0:
+            with st.expander("🧩 Missing Value Pattern"):
+                pattern = chart_data.missing_pattern()
+                fig = px.imshow(
+                    pattern.T,
+                    aspect='auto',
+                    labels={'x': 'Rows', 'y': 'Column', 'color': 'Missing'},
+                    color_continuous_scale='Reds',
+                    zmin=0,
+                    zmax=1
+                )
+                fig.update_layout(height=chart_height)
+                st.plotly_chart(fig, use_container_width=True)
+        
+        # Strongest pairwise relationships
+        with st.expander("🔗 Strongest Relationships"):
+            corr_method = st.radio(
+                "Numeric correlation:",
+                ["pearson", "spearman"],
+                horizontal=True,
+                format_func=str.capitalize
+            )
+            top_k = st.slider("Pairs to show:", 5, 50, 20)
+            # Built once per dataset and method; reruns and a new k only re-rank it
+            associations = st.session_state.setdefault('associations', {})
+            if corr_method not in associations:
+                associations[corr_method] = analyzer.get_associations(corr_method)
+            top_pairs = associations[corr_method].top_pairs(top_k)
+            if not top_pairs.empty:
+                st.dataframe(top_pairs, use_container_width=True)
+                st.caption("Categorical pairs use Cramér's V, mixed pairs the correlation ratio.")
+            else:
+                st.info("Not enough columns to compare.")
+        
+        # Drift against an earlier upload of the same feed
+        with st.expander("🕒 Compare with a Snapshot"):
+            from core.snapshot import SnapshotStore, compare_snapshots
+            
+            store = SnapshotStore.from_env()
+            source_name = st.session_state.get('source_name', 'data')
+            if st.session_state.get('snapshot') is None:
+                st.session_state.snapshot = analyzer.get_profile_snapshot(source_name)
+            current = st.session_state.snapshot
+            
+            # Snapshots of this feed first, newest first
+            saved = sorted(store.list(), key=lambda p: not p.name.startswith(f"{source_name}__"))
+            if saved:
+                baseline_path = st.selectbox(
+                    "Compare with:",
+                    saved,
+                    format_func=lambda p: p.stem.replace('__', ' · ')
+                )
+                report = compare_snapshots(store.load(baseline_path), current)
+                drift = report['columns']
+                changed = drift[drift['status'] != 'ok']
+                
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Schema", "Changed" if report['schema_changed'] else "Same")
+                col2.metric("Rows", f"{report['rows_after']:,}", f"{report['rows_after'] - report['rows_before']:+,}")
+                col3.metric("Changed Columns", len(changed))
+                
+                if len(changed):
+                    st.dataframe(
+                        changed[['column', 'status', 'old_type', 'new_type', 'null_rate_change',
+                                 'distinct_change', 'psi', 'ks', 'reasons']].round(3),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+                else:
+                    st.success("✨ No schema or distribution changes detected")
+            else:
+                st.info("💡 No snapshots saved yet. Save one now to compare the next upload against it.")
+            
+            if st.button("💾 Save Snapshot"):
+                path = store.save(current)
+                st.success(f"✅ Saved {path.name}")
+        
         # Detailed column info
         with st.expander("📋 Detailed Column Information"):
             col_info = analyzer.get_column_info()
@@ -377,11 +584,14 @@ elif page == "🔍 Analyze":
 elif page == "🧹 Clean":
     st.header("🧹 Clean Your Data")
     
-    if st.session_state.df is None:
+    if frames.get('df') is None:
         st.warning("⚠️ Please upload data first!")
     else:
-        df = st.session_state.df.copy()
+        from core.cleaner import DataCleaner
+        
+        df = working_frame()
         cleaner = DataCleaner(df)
+        cleaner.use_governor(governor, frames.session_id)
         
         # Show AI recommendations
         recommendations = st.session_state.recommendations
@@ -480,49 +690,57 @@ elif page == "🧹 Clean":
         st.divider()
         
         if st.button("🚀 Start Cleaning", type="primary"):
-            with st.spinner("Cleaning in progress..."):
-                cleaned_df = df.copy()
-                operations = []
-                
-                if remove_duplicates:
-                    before = len(cleaned_df)
-                    cleaned_df = cleaner.remove_duplicates(cleaned_df)
-                    removed = before - len(cleaned_df)
-                    operations.append(f"✅ Removed {removed} duplicate rows")
-                
-                if handle_missing:
-                    cleaned_df = cleaner.handle_missing(cleaned_df, missing_strategy)
-                    operations.append(f"✅ Handled missing values using: {missing_strategy}")
-                
-                if remove_outliers:
-                    cleaned_df = cleaner.remove_outliers(cleaned_df)
-                    operations.append("✅ Removed outliers from numeric columns")
-                
-                if standardize_text:
-                    cleaned_df = cleaner.standardize_text(cleaned_df)
-                    operations.append("✅ Standardized text columns")
-                
-                if convert_types:
-                    cleaned_df = cleaner.convert_types(cleaned_df)
-                    operations.append("✅ Converted data types")
-                
-                st.session_state.cleaned_df = cleaned_df
-                
-                st.success("🎉 Cleaning completed!")
-                for op in operations:
-                    st.write(op)
+            try:
+                with st.spinner("Cleaning in progress..."):
+                    cleaned_df = df
+                    operations = []
+                    lineage = cleaner.start_lineage(cleaned_df)
+                    
+                    if remove_duplicates:
+                        before = len(cleaned_df)
+                        cleaned_df = cleaner.remove_duplicates(cleaned_df)
+                        removed = before - len(cleaned_df)
+                        operations.append(f"✅ Removed {removed} duplicate rows")
+                    
+                    if handle_missing:
+                        cleaned_df = cleaner.handle_missing(cleaned_df, missing_strategy)
+                        operations.append(f"✅ Handled missing values using: {missing_strategy}")
+                    
+                    if remove_outliers:
+                        cleaned_df = cleaner.remove_outliers(cleaned_df)
+                        operations.append("✅ Removed outliers from numeric columns")
+                    
+                    if standardize_text:
+                        cleaned_df = cleaner.standardize_text(cleaned_df)
+                        operations.append("✅ Standardized text columns")
+                    
+                    if convert_types:
+                        cleaned_df = cleaner.convert_types(cleaned_df)
+                        operations.append("✅ Converted data types")
+                    
+                    frames['cleaned_df'] = cleaned_df
+                    st.session_state.lineage = lineage.finish(cleaned_df)
+                    
+                    st.success("🎉 Cleaning completed!")
+                    for op in operations:
+                        st.write(op)
+            except MemoryBudgetError as e:
+                st.error(f"❌ Not enough memory to clean this dataset: {str(e)}")
 
 # Page: Results
 elif page == "📊 Results":
     st.header("📊 Cleaning Results")
     
-    if st.session_state.cleaned_df is None:
+    if frames.get('cleaned_df') is None:
         st.warning("⚠️ Please clean your data first!")
+    elif st.session_state.lineage is None or not st.session_state.lineage.matches(working_frame()):
+        st.warning("⚠️ The data changed since it was cleaned. Please clean it again!")
     else:
-        original_df = st.session_state.df
-        cleaned_df = st.session_state.cleaned_df
+        original_df = working_frame()
+        cleaned_df = frames['cleaned_df']
+        lineage = st.session_state.lineage
         
-        # Comparison metrics
+        # Comparison metrics come from the lineage recorded while cleaning
         col1, col2, col3 = st.columns(3)
         
         with col1:
@@ -533,8 +751,8 @@ elif page == "📊 Results":
             )
         
         with col2:
-            original_missing = original_df.isnull().sum().sum()
-            cleaned_missing = cleaned_df.isnull().sum().sum()
+            original_missing = lineage.missing_before
+            cleaned_missing = lineage.missing_after
             st.metric(
                 "Missing Values",
                 cleaned_missing,
@@ -542,14 +760,41 @@ elif page == "📊 Results":
             )
         
         with col3:
-            original_dupes = original_df.duplicated().sum()
-            cleaned_dupes = cleaned_df.duplicated().sum()
+            original_dupes, cleaned_dupes = lineage.count_duplicates(original_df, cleaned_df)
             st.metric(
                 "Duplicates",
                 cleaned_dupes,
                 f"{cleaned_dupes - original_dupes:,}"
             )
         
+        # Step-by-step drill-down
+        if lineage.steps:
+            with st.expander("🔎 What Each Step Did"):
+                st.dataframe(lineage.summary(), use_container_width=True)
+                
+                filled = lineage.filled_counts()
+                if not filled.empty:
+                    st.caption("Missing values filled per column")
+                    st.dataframe(filled, use_container_width=True)
+                
+                step_names = [f"{i + 1}. {entry['step']}" for i, entry in enumerate(lineage.steps)]
+                step_idx = st.selectbox(
+                    "Inspect step:",
+                    range(len(step_names)),
+                    format_func=lambda i: step_names[i]
+                )
+                
+                removed = lineage.removed_rows(original_df, step_idx)
+                changed = lineage.changed_rows(original_df, step_idx)
+                if not removed.empty:
+                    st.caption(f"Rows removed ({len(removed):,}, original values)")
+                    st.dataframe(removed.head(100), use_container_width=True)
+                if not changed.empty:
+                    st.caption(f"Rows changed ({len(changed):,}, original values)")
+                    st.dataframe(changed.head(100), use_container_width=True)
+                if removed.empty and changed.empty:
+                    st.info("This step did not change any rows.")
+        
         st.divider()
         
         # Side by side comparison - responsive
@@ -578,10 +823,10 @@ elif page == "📊 Results":
 elif page == "💾 Export":
     st.header("💾 Export Cleaned Data")
     
-    if st.session_state.cleaned_df is None:
+    if frames.get('cleaned_df') is None:
         st.warning("⚠️ Please clean your data first!")
     else:
-        cleaned_df = st.session_state.cleaned_df
+        cleaned_df = frames['cleaned_df']
         
         # Responsive export layout
         if st.session_state.get('compact_mode', False):
@@ -607,6 +852,7 @@ elif page == "💾 Export":
                     mime = 'text/csv'
                     ext = 'csv'
                 elif export_format == "Excel":
+                    import pandas as pd
                     from io import BytesIO
                     buffer = BytesIO()
                     with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
@@ -630,6 +876,55 @@ elif page == "💾 Export":
             except Exception as e:
                 st.error(f"❌ Export error: {str(e)}")
                 st.info("💡 Try a different format or check your data")
+            
+            # Pre-aggregated table for dashboards
+            with st.expander("📦 Summary Cube"):
+                from core.cube import SummaryCube, GRAINS, AGGREGATIONS
+                
+                st.caption("One row per group instead of one per record, for dashboard refreshes")
+                numeric_cols = cleaned_df.select_dtypes(include='number').columns.tolist()
+                other_cols = [c for c in cleaned_df.columns if c not in numeric_cols]
+                
+                date_column = st.selectbox("Date column:", ["None"] + other_cols, key='cube_date')
+                date_column = None if date_column == "None" else date_column
+                grain = None
+                dayfirst = False
+                if date_column:
+                    grain = st.selectbox("Date grain:", list(GRAINS), index=list(GRAINS).index('month'), key='cube_grain')
+                    if cleaned_df[date_column].dtype.kind != 'M':
+                        # 03/04/2024 is 3 April day-first and 4 March otherwise
+                        dayfirst = st.checkbox("Day comes first (31/12/2024)", key='cube_dayfirst')
+                dimensions = st.multiselect(
+                    "Group by:", [c for c in other_cols if c != date_column], key='cube_dimensions'
+                )
+                measures = st.multiselect("Measures:", numeric_cols, key='cube_measures')
+                aggregations = st.multiselect(
+                    "Aggregations:", list(AGGREGATIONS), default=['sum', 'mean'], key='cube_aggregations'
+                )
+                
+                if dimensions or date_column:
+                    try:
+                        cube = SummaryCube(
+                            dimensions,
+                            {m: aggregations for m in measures},
+                            date_column,
+                            [grain] if grain else (),
+                            dayfirst=dayfirst
+                        )
+                        summary = cube.update(cleaned_df).table(grain)
+                        st.dataframe(summary.head(100), use_container_width=True)
+                        st.caption(f"{len(summary):,} summary rows from {len(cleaned_df):,} records")
+                        st.download_button(
+                            label="⬇️ Download Summary CSV",
+                            data=summary.to_csv(index=False).encode('utf-8'),
+                            file_name=f"{filename}_summary.csv",
+                            mime='text/csv',
+                            use_container_width=True
+                        )
+                    except Exception as e:
+                        st.error(f"❌ Summary error: {str(e)}")
+                else:
+                    st.info("💡 Pick a date column or at least one column to group by")
         
         if len(cols) > 1:
             with cols[1]:
@@ -643,3 +938,47 @@ elif page == "💾 Export":
             st.info(f"""
             **Export Summary:** {len(cleaned_df):,} rows × {len(cleaned_df.columns)} columns
             """)
+
+
+# Load the heavy modules in the background once the first page is up
+@st.cache_resource
+def prewarm_imports():
+    if os.environ.get('DATA_APP_PREWARM', '1') == '0':
+        return None
+    
+    def load():
+        for module in ('pandas', 'numpy', 'plotly.express', 'openpyxl',
+                       'core.analyzer', 'core.cleaner', 'core.charts', 'core.loader', 'core.subset'):
+            try:
+                __import__(module)
+            except ImportError:
+                pass
+    
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
+
+prewarm_imports()
+
+if 'subset' in frames:
+    filter_status.caption(f"🔎 Filtered: {len(frames['subset']):,} of {len(frames['df']):,} rows")
+
+# Performance panel
+if show_performance:
+    events = profiler.stop_capture()
+    with st.sidebar.expander("⚡ Performance", expanded=True):
+        if events:
+            perf = profiler.to_frame(events)
+            perf['operation'] = perf['operation'].str.split('.').str[-1]
+            columns = ['operation', 'wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out']
+            if trace_memory:
+                perf['peak_mb'] = perf['peak_memory_bytes'].astype(float) / 1024**2
+                columns.insert(3, 'peak_mb')
+            st.dataframe(
+                perf[columns].round(4),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption(f"Total: {perf['wall_seconds'].sum():.3f} s over {len(perf)} calls")
+        else:
+            st.caption("No analysis or cleaning ran on this page.")
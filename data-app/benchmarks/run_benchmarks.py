@@ -0,0 +1,190 @@
+"""Time and memory-profile DataAnalyzer and DataCleaner on synthetic data.
+
+Run from the data-app folder:
+
+    python benchmarks/run_benchmarks.py run --schema sales --rows 10000 100000 1000000
+    python benchmarks/run_benchmarks.py compare old.json new.json
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(APP_DIR))
+sys.path.append(str(Path(__file__).resolve().parent))
+from core.analyzer import DataAnalyzer
+from core.cleaner import DataCleaner
+from synthetic import SCHEMAS, SyntheticDataGenerator
+
+# Parsing warnings from convert_types would drown out the timings
+warnings.filterwarnings('ignore', category=UserWarning)
+
+STRATEGIES = ["Drop rows", "Fill with mean", "Fill with median", "Fill with mode", "Forward fill"]
+
+TARGETS = [
+    ('DataAnalyzer.get_missing_summary', lambda df: DataAnalyzer(df).get_missing_summary()),
+    ('DataAnalyzer.get_column_info', lambda df: DataAnalyzer(df).get_column_info()),
+    ('DataAnalyzer.auto_detect_issues', lambda df: DataAnalyzer(df).auto_detect_issues()),
+    ('DataAnalyzer.get_data_quality_score', lambda df: DataAnalyzer(df).get_data_quality_score()),
+    ('DataAnalyzer.get_top_correlations', lambda df: DataAnalyzer(df).get_top_correlations()),
+    ('DataCleaner.remove_duplicates', lambda df: DataCleaner(df).remove_duplicates(df)),
+    *[
+        (f'DataCleaner.handle_missing[{strategy}]',
+         lambda df, strategy=strategy: DataCleaner(df).handle_missing(df, strategy))
+        for strategy in STRATEGIES
+    ],
+    ('DataCleaner.remove_outliers', lambda df: DataCleaner(df).remove_outliers(df)),
+    ('DataCleaner.standardize_text', lambda df: DataCleaner(df).standardize_text(df)),
+    ('DataCleaner.convert_types', lambda df: DataCleaner(df).convert_types(df)),
+]
+
+
+def measure(func, df, repeat=1, memory=False):
+    """Best wall time over repeats, plus peak traced memory if asked"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(df)
+        times.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        # Tracing slows Python code down, so it gets its own run
+        gc.collect()
+        tracemalloc.start()
+        func(df)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return min(times), peak_mb
+
+
+def environment():
+    """Versions and commit the results were produced with"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=APP_DIR
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor()
+    }
+
+
+def run(args):
+    targets = [t for t in TARGETS if not args.only or any(s in t[0] for s in args.only)]
+    results = []
+
+    for schema in args.schema:
+        generator = SyntheticDataGenerator.from_name(schema, seed=args.seed)
+        for rows in args.rows:
+            df = generator.generate(
+                rows,
+                columns=args.columns,
+                missing_rate=args.missing_rate,
+                duplicate_rate=args.duplicate_rate,
+                outlier_rate=args.outlier_rate,
+                text_messiness=args.text_messiness,
+                cardinality=args.cardinality
+            )
+            frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+            print(f"\n{schema}: {rows:,} rows x {df.shape[1]} columns ({frame_mb:,.0f} MB)")
+
+            for name, func in targets:
+                seconds, peak_mb = measure(func, df, args.repeat, args.memory)
+                results.append({
+                    'schema': schema,
+                    'rows': rows,
+                    'columns': df.shape[1],
+                    'target': name,
+                    'seconds': seconds,
+                    'peak_mb': peak_mb
+                })
+                memory = f"  {peak_mb:10,.1f} MB" if peak_mb is not None else ""
+                print(f"  {name:50s} {seconds:10.4f} s{memory}")
+            del df
+
+    output = Path(args.output or APP_DIR / 'benchmarks' / 'results' /
+                  f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'environment': environment(),
+        'settings': {k: v for k, v in vars(args).items() if k != 'func'},
+        'results': results
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+
+def compare(args):
+    """Compare two result files and flag slowdowns beyond the threshold"""
+    def load(path):
+        data = json.loads(Path(path).read_text())
+        return {(r['schema'], r['rows'], r['columns'], r['target']): r for r in data['results']}
+
+    old, new = load(args.old), load(args.new)
+    regressions = 0
+    print(f"{'target':50s} {'rows':>12s} {'old s':>10s} {'new s':>10s} {'change':>8s}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key]['seconds'], new[key]['seconds']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{key[3]:50s} {key[1]:12,d} {before:10.4f} {after:10.4f} {change:+8.1%}{flag}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--schema', nargs='+', default=['sales'], choices=sorted(SCHEMAS))
+    run_parser.add_argument('--rows', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+    run_parser.add_argument('--columns', type=int, default=None, help='repeat or trim the schema to this many columns')
+    run_parser.add_argument('--missing-rate', type=float, default=0.05)
+    run_parser.add_argument('--duplicate-rate', type=float, default=0.02)
+    run_parser.add_argument('--outlier-rate', type=float, default=0.01)
+    run_parser.add_argument('--text-messiness', type=float, default=0.1)
+    run_parser.add_argument('--cardinality', type=int, default=None)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=1)
+    run_parser.add_argument('--memory', action='store_true', help='also record peak memory (extra run per target)')
+    run_parser.add_argument('--only', nargs='+', help='only targets whose name contains one of these')
+    run_parser.add_argument('--output', help='results file (default: benchmarks/results/bench-<time>.json)')
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args) or 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Measure the app's cold start and check it against a time budget.
+
+Each run starts a fresh Python process and renders the first page with
+Streamlit's AppTest, so nothing is cached between runs. Run from the
+data-app folder:
+
+    python benchmarks/startup.py --runs 5 --budget 3.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parents[1] / 'app.py'
+
+# Modules the first page should not need
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.express', 'openpyxl', 'core.analyzer', 'core.cleaner']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file({app!r}, default_timeout=60)
+app.run()
+done = time.perf_counter()
+print(json.dumps({{
+    'streamlit_import_seconds': imported - start,
+    'first_run_seconds': done - imported,
+    'total_seconds': done - start,
+    'exceptions': [str(e.value) for e in app.exception],
+    'loaded': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def probe():
+    """Cold-start the app once in a new process"""
+    # Background pre-warming would blur which modules the first page loads
+    env = dict(os.environ, DATA_APP_PREWARM='0')
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE.format(app=str(APP_PATH), heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, env=env, cwd=APP_PATH.parent
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip() or 'startup probe failed')
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=3.0, help='median seconds allowed for the first page')
+    parser.add_argument('--output', help='write the measurements to this JSON file')
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    median = statistics.median(r['total_seconds'] for r in runs)
+    first_run = statistics.median(r['first_run_seconds'] for r in runs)
+    loaded = sorted({m for r in runs for m in r['loaded']})
+    exceptions = sorted({e for r in runs for e in r['exceptions']})
+
+    print(f"Cold start (median of {args.runs}): {median:.2f} s, of which first page {first_run:.2f} s")
+    print(f"Heavy modules loaded by the first page: {', '.join(loaded) or 'none'}")
+    for exception in exceptions:
+        print(f"App raised: {exception}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            'budget_seconds': args.budget,
+            'median_seconds': median,
+            'runs': runs
+        }, indent=2))
+
+    if exceptions or median > args.budget:
+        print(f"FAILED: budget is {args.budget:.2f} s")
+        sys.exit(1)
+    print(f"OK: within the {args.budget:.2f} s budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Real feeds in this repo whose schemas the generator can imitate
+SCHEMAS = {
+    'sales': (REPO_ROOT / 'sale-analysis-db' / 'sales_data.csv', ','),
+    'delivery': (REPO_ROOT / 'delivery-time-analysis-db' / 'zomato_swiggy_delivery_time_10000_rows.csv', ','),
+    'telecom': (REPO_ROOT / 'airtel-jio-performance-db' / 'Airtel_Jio_data.csv', ','),
+    'titanic': (REPO_ROOT / 'internship' / 'task-2' / 'titanic.csv', ','),
+    'students': (REPO_ROOT / 'internship' / 'task-1' / 'student-mat.csv', ';')
+}
+
+DATE_FORMATS = ['%Y-%m-%d', '%d-%m-%Y', '%m/%d/%Y', '%d/%m/%Y', '%H:%M']
+TEXT_POOL_SIZE = 100_000
+SCHEMA_SAMPLE_ROWS = 10_000
+
+
+def _learn_column(series):
+    """Describe one column well enough to generate more like it"""
+    values = series.dropna()
+    if len(values) == 0:
+        return {'kind': 'float', 'mean': 0.0, 'std': 1.0, 'min': 0.0, 'max': 1.0}
+
+    if pd.api.types.is_numeric_dtype(values):
+        if values.is_unique and pd.api.types.is_integer_dtype(values):
+            return {'kind': 'id', 'start': int(values.min())}
+        if values.nunique() <= 20:
+            freq = values.value_counts(normalize=True)
+            return {'kind': 'category', 'levels': freq.index.to_numpy(), 'probs': freq.to_numpy()}
+        return {
+            'kind': 'int' if pd.api.types.is_integer_dtype(values) else 'float',
+            'mean': float(values.mean()),
+            'std': float(values.std() or 1.0),
+            'min': float(values.min()),
+            'max': float(values.max())
+        }
+
+    values = values.astype(str)
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+        if parsed.notna().mean() > 0.95:
+            return {'kind': 'datetime', 'format': fmt, 'min': parsed.min(), 'max': parsed.max()}
+
+    if values.nunique() <= max(50, len(values) // 2):
+        freq = values.value_counts(normalize=True)
+        return {'kind': 'category', 'levels': freq.index.to_numpy(dtype=object), 'probs': freq.to_numpy()}
+    return {'kind': 'text', 'samples': values.head(1000).to_numpy(dtype=object)}
+
+
+def learn_schema(path, sep=','):
+    """Learn a column schema from a sample of a CSV file"""
+    sample = pd.read_csv(path, sep=sep, nrows=SCHEMA_SAMPLE_ROWS)
+    return {col: _learn_column(sample[col]) for col in sample.columns}
+
+
+class SyntheticDataGenerator:
+    """Generate data shaped like a real feed, with controllable dirtiness"""
+
+    def __init__(self, schema, seed=0):
+        self.schema = schema
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_name(cls, name, seed=0):
+        """Generator seeded from one of the repo's CSV schemas"""
+        path, sep = SCHEMAS[name]
+        return cls(learn_schema(path, sep), seed)
+
+    def generate(self, rows, columns=None, missing_rate=0.05, duplicate_rate=0.02,
+                 outlier_rate=0.01, text_messiness=0.1, cardinality=None):
+        """Generate a frame of the given size and dirtiness.
+
+        columns repeats or trims the schema to that many columns, and
+        cardinality overrides the number of distinct values of text and
+        category columns.
+        """
+        specs = list(self.schema.items())
+        columns = columns or len(specs)
+        data = {}
+        for i in range(columns):
+            name, spec = specs[i % len(specs)]
+            if i >= len(specs):
+                name = f"{name}_{i // len(specs) + 1}"
+            data[name] = self._column(spec, rows, missing_rate, outlier_rate,
+                                      text_messiness, cardinality)
+
+        n_dupes = int(rows * duplicate_rate)
+        if n_dupes and rows > 1:
+            targets = self.rng.choice(rows, n_dupes, replace=False)
+            sources = self.rng.integers(0, rows, n_dupes)
+            for values in data.values():
+                values[targets] = values[sources]
+        return pd.DataFrame(data)
+
+    def _column(self, spec, rows, missing_rate, outlier_rate, text_messiness, cardinality):
+        kind = spec['kind']
+        rng = self.rng
+
+        if kind == 'id':
+            return np.arange(spec['start'], spec['start'] + rows)
+        elif kind in ('int', 'float'):
+            values = rng.normal(spec['mean'], spec['std'], rows).clip(spec['min'], spec['max'])
+            if kind == 'int':
+                values = values.round()
+            outliers = rng.random(rows) < outlier_rate
+            signs = rng.choice([-1, 1], outliers.sum())
+            values[outliers] = spec['mean'] + signs * 10 * spec['std']
+        elif kind == 'datetime':
+            days = pd.date_range(spec['min'], spec['max'], freq='min' if spec['format'] == '%H:%M' else 'D')
+            pool = np.asarray(days.strftime(spec['format']), dtype=object)
+            values = pool[rng.integers(0, len(pool), rows)]
+        else:
+            levels, probs = self._levels(spec, cardinality, rows)
+            codes = rng.choice(len(levels), rows, p=probs)
+            if pd.api.types.is_numeric_dtype(levels.dtype):
+                values = levels[codes].astype(np.float64)
+            else:
+                values = self._messy(levels, codes, text_messiness)
+
+        missing = rng.random(rows) < missing_rate
+        if values.dtype == object:
+            values[missing] = None
+        else:
+            values[missing] = np.nan
+        return values
+
+    def _levels(self, spec, cardinality, rows):
+        """Distinct values and their probabilities for a text or category column"""
+        if spec['kind'] == 'category' and cardinality is None:
+            return spec['levels'], spec['probs']
+        if spec['kind'] == 'category' and pd.api.types.is_numeric_dtype(spec['levels'].dtype):
+            return spec['levels'], spec['probs']
+
+        base = spec['levels'] if spec['kind'] == 'category' else spec['samples']
+        size = cardinality or min(TEXT_POOL_SIZE, max(rows, 1))
+        if size <= len(base):
+            levels = np.asarray(base[:size], dtype=object)
+        else:
+            extra = [f"{base[i % len(base)]} {i}" for i in range(len(base), size)]
+            levels = np.concatenate([np.asarray(base, dtype=object), np.asarray(extra, dtype=object)])
+        return levels, np.full(len(levels), 1 / len(levels))
+
+    def _messy(self, levels, codes, text_messiness):
+        """Pick values, swapping some for padded or re-cased variants"""
+        levels = np.asarray([str(v) for v in levels], dtype=object)
+        variants = np.concatenate([
+            levels,
+            np.asarray([f" {v} " for v in levels], dtype=object),
+            np.asarray([v.upper() for v in levels], dtype=object),
+            np.asarray([v.lower() + ' ' for v in levels], dtype=object)
+        ])
+        messy = self.rng.random(len(codes)) < text_messiness
+        codes = codes.copy()
+        codes[messy] += self.rng.integers(1, 4, messy.sum()) * len(levels)
+        return variants[codes]
@@ -1,10 +1,15 @@
 import pandas as pd
 import numpy as np
 
+from .profiling import instrument
+from .correlation import AssociationMatrix
+from .snapshot import ProfileSnapshot
+
 class DataAnalyzer:
     def __init__(self, df):
         self.df = df
     
+    @instrument
     def get_missing_summary(self):
         """Get summary of missing values"""
         missing = self.df.isnull().sum()
@@ -18,6 +23,7 @@ class DataAnalyzer:
         
         return summary[summary['missing_count'] > 0].sort_values('missing_percentage', ascending=False)
     
+    @instrument
     def get_column_info(self):
         """Get detailed column information"""
         info_list = []
@@ -44,6 +50,35 @@ class DataAnalyzer:
         
         return pd.DataFrame(info_list)
     
+    def get_top_correlations(self, k=20, method='pearson', chunk_rows=100_000):
+        """Get the k most strongly associated column pairs.
+        
+        Numeric pairs use Pearson or Spearman, categorical pairs Cramer's V
+        and mixed pairs the correlation ratio.
+        """
+        return self.get_associations(method, chunk_rows).top_pairs(k)
+    
+    @instrument
+    def get_associations(self, method='pearson', chunk_rows=100_000):
+        """Association matrix over every column pair; keep it to take top pairs for any k"""
+        df = self.df
+        if method == 'spearman':
+            # Ranks need whole columns, so they are taken before chunking
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            df = df.copy(deep=False)
+            df[numeric_cols] = self.df[numeric_cols].rank()
+        
+        associations = AssociationMatrix(method=method)
+        for start in range(0, max(len(df), 1), chunk_rows):
+            associations.update(df.iloc[start:start + chunk_rows])
+        return associations
+    
+    @instrument
+    def get_profile_snapshot(self, name=None):
+        """Compact profile to save and compare later uploads against"""
+        return ProfileSnapshot.from_frame(self.df, name)
+    
+    @instrument
     def auto_detect_issues(self):
         """Automatically detect data quality issues and return recommendations"""
         issues = []
@@ -166,6 +201,7 @@ class DataAnalyzer:
         
         return issues, recommendations
     
+    @instrument
     def get_data_quality_score(self):
         """Calculate overall data quality score (0-100)"""
         score = 100
@@ -0,0 +1,140 @@
+import pandas as pd
+import numpy as np
+
+MIN_BINS = 10
+MAX_BINS = 200
+BIN_SAMPLE_ROWS = 100_000
+
+
+def _as_float(series):
+    """Numeric or datetime values as float64, with NaN for missing"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+        values[series.isna().to_numpy()] = np.nan
+        return values
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _bin_count(values):
+    """Freedman-Diaconis bin count, estimated on a sample for large columns"""
+    if len(values) > BIN_SAMPLE_ROWS:
+        rng = np.random.default_rng(0)
+        sample = values[rng.integers(0, len(values), BIN_SAMPLE_ROWS)]
+    else:
+        sample = values
+    q1, q3 = np.percentile(sample, [25, 75])
+    width = 2 * (q3 - q1) / len(sample) ** (1 / 3)
+    if width <= 0:
+        return MIN_BINS
+    bins = int(np.ceil((values.max() - values.min()) / width))
+    return int(np.clip(bins, MIN_BINS, MAX_BINS))
+
+
+def lttb_indices(x, y, points):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets"""
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    bucket = (n - 2) / (points - 2)
+    keep = np.empty(points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+class ChartData:
+    """Aggregate columns on the server so charts only ship summaries"""
+
+    def __init__(self, df):
+        self.df = df
+
+    def histogram(self, col, bins=None):
+        """Bin counts of a numeric or datetime column"""
+        series = self.df[col]
+        values = _as_float(series)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return pd.DataFrame(columns=['bin_start', 'bin_end', 'count'])
+
+        bins = bins or _bin_count(values)
+        lo, hi = values.min(), values.max()
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        counts, edges = np.histogram(values, bins=bins, range=(lo, hi))
+
+        result = pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+        if pd.api.types.is_datetime64_any_dtype(series):
+            result['bin_start'] = pd.to_datetime(result['bin_start'].astype(np.int64))
+            result['bin_end'] = pd.to_datetime(result['bin_end'].astype(np.int64))
+        return result
+
+    def category_counts(self, col, top=20):
+        """Counts of the most frequent values, the rest grouped as 'Other'"""
+        counts = self.df[col].value_counts(dropna=False)
+        result = pd.DataFrame({
+            'value': counts.index[:top].map(lambda v: '(missing)' if pd.isna(v) else str(v)),
+            'count': counts.values[:top]
+        })
+        if len(counts) > top:
+            other = pd.DataFrame({'value': [f"Other ({len(counts) - top:,} values)"],
+                                  'count': [counts.values[top:].sum()]})
+            result = pd.concat([result, other], ignore_index=True)
+        return result
+
+    def heatmap(self, x_col, y_col, bins=50):
+        """2D bin counts of two numeric columns, indexed by bin centres"""
+        x = _as_float(self.df[x_col])
+        y = _as_float(self.df[y_col])
+        both = ~np.isnan(x) & ~np.isnan(y)
+        counts, x_edges, y_edges = np.histogram2d(x[both], y[both], bins=bins)
+        return pd.DataFrame(
+            counts.T,
+            index=(y_edges[:-1] + y_edges[1:]) / 2,
+            columns=(x_edges[:-1] + x_edges[1:]) / 2
+        )
+
+    def downsample_line(self, y_col, x_col=None, points=1000):
+        """LTTB-downsampled line of y against x (row order by default)"""
+        y = _as_float(self.df[y_col])
+        x = _as_float(self.df[x_col]) if x_col else np.arange(len(y), dtype=np.float64)
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        positions = np.flatnonzero(valid)
+
+        if x_col:
+            positions = positions[np.argsort(x[positions], kind='stable')]
+        keep = positions[lttb_indices(x[positions], y[positions], points)]
+
+        return pd.DataFrame({
+            x_col or 'row': self.df[x_col].iloc[keep].to_numpy() if x_col else keep,
+            y_col: self.df[y_col].iloc[keep].to_numpy()
+        })
+
+    def missing_pattern(self, blocks=100):
+        """Share of missing values per column in each contiguous block of rows"""
+        rows = len(self.df)
+        if rows == 0:
+            return pd.DataFrame(columns=self.df.columns)
+        blocks = min(blocks, rows)
+        starts = np.linspace(0, rows, blocks + 1).astype(np.int64)[:-1]
+        sizes = np.diff(np.append(starts, rows))
+
+        pattern = {}
+        for col in self.df.columns:
+            missing = self.df[col].isna().to_numpy()
+            pattern[col] = np.add.reduceat(missing, starts, dtype=np.int64) / sizes
+
+        labels = [f"{start + 1:,}-{start + size:,}" for start, size in zip(starts, sizes)]
+        return pd.DataFrame(pattern, index=labels)
@@ -1,62 +1,230 @@
 import pandas as pd
 import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+from .profiling import instrument
+from .lineage import CleaningLineage
 
 class DataCleaner:
     def __init__(self, df):
         self.df = df
+        self.lineage = None
+        self.chunk_rows = None
+        self.governor = None
+        self.session_id = None
+    
+    def use_governor(self, governor, session_id):
+        """Let a MemoryGovernor pick in-memory or chunked execution per step"""
+        self.governor = governor
+        self.session_id = session_id
+    
+    def _plan(self, df, operation):
+        """Ask the governor, if any, how to run an operation on df"""
+        if self.governor is not None:
+            self.chunk_rows = self.governor.plan(self.session_id, df, operation)['chunk_rows']
+        return self.chunk_rows
+    
+    def _chunks(self, df):
+        """Split df into row slices of at most chunk_rows rows"""
+        for start in range(0, len(df), self.chunk_rows):
+            yield df.iloc[start:start + self.chunk_rows]
+    
+    def _apply(self, df, func):
+        """Apply a row-wise func to df, one chunk at a time when chunking"""
+        if self.chunk_rows is None or len(df) <= self.chunk_rows:
+            return func(df)
+        return self._by_column(df, lambda column: (func(chunk) for chunk in self._chunks(column)))
+    
+    def _row_mask(self, df, func):
+        """Boolean row mask from a per-chunk func, one chunk at a time when chunking"""
+        if self.chunk_rows is None or len(df) <= self.chunk_rows:
+            return func(df).to_numpy()
+        return np.concatenate([func(chunk).to_numpy() for chunk in self._chunks(df)])
+    
+    def _by_column(self, df, pieces):
+        """Build the output one column at a time from its row-chunk results.
+        
+        pieces(column) yields the result for each chunk of a one-column frame.
+        A column is copied only once a chunk changes it; the others stay shared
+        with df, so the peak is the changed columns plus one chunk, as in place.
+        """
+        out = df.copy(deep=False)
+        for i in range(df.shape[1]):
+            column = df.iloc[:, [i]]
+            values, dtype, start = None, None, 0
+            for piece in pieces(column):
+                piece = piece.iloc[:, 0]
+                end = start + len(piece)
+                if values is None and not (piece.dtype == column.dtypes.iloc[0]
+                                           and piece.equals(column.iloc[start:end, 0])):
+                    # First change: copy the column, earlier chunks were left as they were
+                    dtype = piece.dtype
+                    storage = dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+                    values = column.iloc[:, 0].to_numpy(dtype=storage, copy=True)
+                if values is not None:
+                    values[start:end] = piece.to_numpy(dtype=values.dtype)
+                start = end
+            if values is not None:
+                out.isetitem(i, pd.Series(values, index=df.index, copy=False).astype(dtype, copy=False))
+        return out
+    
+    def start_lineage(self, df):
+        """Start recording a lineage for the steps applied to df"""
+        self.lineage = CleaningLineage(df)
+        return self.lineage
     
+    def _record(self, step, before, after, keep=None, **hints):
+        """Add a step to the lineage, if one is being recorded"""
+        if self.lineage is not None:
+            self.lineage.record(step, before, after, keep, **hints)
+        return after
+    
+    @instrument
     def remove_duplicates(self, df):
         """Remove duplicate rows"""
-        return df.drop_duplicates()
+        if self._plan(df, 'remove_duplicates') and len(df) > self.chunk_rows:
+            # Compare 64-bit row hashes instead of whole rows
+            hashes = np.concatenate([
+                pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                for chunk in self._chunks(df)
+            ])
+            keep = ~pd.Series(hashes).duplicated().to_numpy()
+        else:
+            keep = ~df.duplicated().to_numpy()
+        return self._record('Remove duplicates', df, df[keep], keep, deduplicates=True)
     
+    @instrument
     def handle_missing(self, df, strategy="Drop rows"):
         """Handle missing values based on strategy"""
+        step = f"Missing values: {strategy}"
+        self._plan(df, 'handle_missing')
         if strategy == "Drop rows":
-            return df.dropna()
+            keep = self._row_mask(df, lambda chunk: chunk.notna().all(axis=1))
+            return self._record(step, df, df[keep], keep)
         elif strategy == "Fill with mean":
-            return df.fillna(df.mean(numeric_only=True))
+            values = df.mean(numeric_only=True)
         elif strategy == "Fill with median":
-            return df.fillna(df.median(numeric_only=True))
+            values = df.median(numeric_only=True)
         elif strategy == "Fill with mode":
-            return df.fillna(df.mode().iloc[0])
+            values = df.mode().iloc[0]
         elif strategy == "Forward fill":
-            return df.fillna(method='ffill')
-        return df
+            return self._record(step, df, self._forward_fill(df), fills_only=True)
+        else:
+            return df
+        return self._record(step, df, self._apply(df, lambda chunk: chunk.fillna(values)), fills_only=True)
     
+    def _forward_fill(self, df):
+        """Forward fill, carrying the last row of each chunk into the next"""
+        if self.chunk_rows is None or len(df) <= self.chunk_rows:
+            return df.ffill()
+        
+        def fill(column):
+            last = None
+            for chunk in self._chunks(column):
+                chunk = chunk.ffill()
+                if last is not None:
+                    # Gaps at the top of a chunk continue the previous chunk
+                    chunk = chunk.fillna(last)
+                last = chunk.iloc[-1]
+                yield chunk
+        
+        return self._by_column(df, fill)
+    
+    @instrument
     def remove_outliers(self, df, threshold=3):
         """Remove outliers using Z-score method"""
+        self._plan(df, 'remove_outliers')
         numeric_cols = df.select_dtypes(include=[np.number]).columns
-        df_clean = df.copy()
+        keep = np.ones(len(df), dtype=bool)
         
+        # Each column is scored on the rows that survived the previous ones
         for col in numeric_cols:
-            z_scores = np.abs((df_clean[col] - df_clean[col].mean()) / df_clean[col].std())
-            df_clean = df_clean[z_scores < threshold]
+            if self.chunk_rows is not None and len(df) > self.chunk_rows:
+                self._chunked_zscore_keep(df[col], keep, threshold)
+                continue
+            values = df[col][keep]
+            z_scores = np.abs((values - values.mean()) / values.std())
+            keep[keep] = (z_scores < threshold).to_numpy()
         
-        return df_clean
+        return self._record('Remove outliers', df, df[keep], keep)
+    
+    def _column_chunks(self, series, keep):
+        """(keep slice, float values of the kept rows) per chunk of one column"""
+        for start in range(0, len(series), self.chunk_rows):
+            kept = keep[start:start + self.chunk_rows]
+            values = series.iloc[start:start + self.chunk_rows].to_numpy(dtype='float64', na_value=np.nan)
+            yield kept, values[kept]
     
+    def _chunked_zscore_keep(self, series, keep, threshold):
+        """Narrow keep to the rows whose z-score is under threshold, in two passes over chunks"""
+        total, count = 0.0, 0
+        for _, values in self._column_chunks(series, keep):
+            total += np.nansum(values)
+            count += np.count_nonzero(~np.isnan(values))
+        mean = total / count if count else np.nan
+        squares = 0.0
+        for _, values in self._column_chunks(series, keep):
+            squares += np.nansum((values - mean) ** 2)
+        std = np.sqrt(squares / (count - 1)) if count > 1 else np.nan
+        for kept, values in self._column_chunks(series, keep):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                kept[kept] = np.abs((values - mean) / std) < threshold
+    
+    @instrument
     def standardize_text(self, df):
         """Standardize text columns"""
-        df_clean = df.copy()
-        text_cols = df_clean.select_dtypes(include=['object']).columns
+        self._plan(df, 'standardize_text')
+        text_cols = df.select_dtypes(include=['object']).columns
         
-        for col in text_cols:
-            df_clean[col] = df_clean[col].str.strip().str.lower()
+        def standardize(chunk):
+            cols = chunk.columns.intersection(text_cols)
+            if len(cols):
+                chunk = chunk.copy()
+            for col in cols:
+                chunk[col] = chunk[col].str.strip().str.lower()
+            return chunk
         
-        return df_clean
+        return self._record('Standardize text', df, self._apply(df, standardize), columns=text_cols)
     
+    @instrument
     def convert_types(self, df):
         """Auto-convert data types"""
-        df_clean = df.copy()
+        self._plan(df, 'convert_types')
+        # Converted columns replace whole columns, so the rest can stay shared
+        df_clean = df.copy(deep=False)
+        converted = []
         
         for col in df_clean.columns:
+            if pd.api.types.is_numeric_dtype(df_clean[col]):
+                continue
             # Try to convert to numeric
             try:
-                df_clean[col] = pd.to_numeric(df_clean[col])
+                df_clean[col] = self._convert_column(df_clean[col], pd.to_numeric)
+                converted.append(col)
             except:
                 # Try to convert to datetime
                 try:
-                    df_clean[col] = pd.to_datetime(df_clean[col])
+                    df_clean[col] = self._convert_column(df_clean[col], pd.to_datetime)
+                    converted.append(col)
                 except:
                     pass
         
-        return df_clean
+        return self._record('Convert types', df, df_clean, columns=converted)
+    
+    def _convert_column(self, series, convert):
+        """Convert one column, parsing a chunk at a time when chunking.
+        
+        Conversion is all-or-nothing per column: a chunk that fails fails the
+        column. Dates use the format guessed from the column's first value, as
+        a whole-column to_datetime would, so every chunk parses alike.
+        """
+        if self.chunk_rows is None or len(series) <= self.chunk_rows:
+            return convert(series)
+        kwargs = {}
+        if convert is pd.to_datetime:
+            first = series.dropna().head(1)
+            if len(first) and isinstance(first.iloc[0], str):
+                kwargs['format'] = guess_datetime_format(first.iloc[0])
+        # Chunks may come back as int and float; concat widens them like one call would
+        return pd.concat([convert(chunk, **kwargs) for chunk in self._chunks(series)])
+
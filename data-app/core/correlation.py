@@ -0,0 +1,225 @@
+import pandas as pd
+import numpy as np
+
+
+class AssociationMatrix:
+    """Pairwise association between columns, built up one chunk of rows at a time.
+
+    Numeric pairs use Pearson correlation (Spearman if the caller feeds ranks),
+    categorical pairs use Cramer's V and mixed pairs the correlation ratio.
+    Every statistic is kept as running sums, so chunks can arrive in any
+    number; only the strongest pairs are reported.
+    """
+
+    def __init__(self, method='pearson', max_categories=100, block_size=64):
+        self.method = method
+        self.max_categories = max_categories
+        self.block_size = block_size
+        self.rows = 0
+        self.numeric_cols = None
+        self.categorical_cols = None
+
+    def _init_columns(self, chunk):
+        """Fix column roles and allocate the running sums from the first chunk"""
+        self.numeric_cols = [
+            col for col in chunk.columns
+            if pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+        ]
+        self.categorical_cols = [
+            col for col in chunk.columns
+            if col not in self.numeric_cols and not pd.api.types.is_datetime64_any_dtype(chunk[col])
+        ]
+
+        p = len(self.numeric_cols)
+        # Values are shifted by the first chunk's means to keep the sums stable
+        first = chunk[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            self._shift = np.nan_to_num(np.nanmean(first, axis=0)) if len(first) else np.zeros(p)
+        self._n = np.zeros((p, p))
+        self._sx = np.zeros((p, p))
+        self._sy = np.zeros((p, p))
+        self._sxx = np.zeros((p, p))
+        self._syy = np.zeros((p, p))
+        self._sxy = np.zeros((p, p))
+
+        self._levels = {col: {} for col in self.categorical_cols}
+        self._tables = {}
+        self._groups = {}
+
+    def update(self, chunk):
+        """Add a chunk of rows to the running sums"""
+        if self.numeric_cols is None:
+            self._init_columns(chunk)
+        self.rows += len(chunk)
+        if len(chunk) == 0:
+            return self
+
+        if self.numeric_cols:
+            values = chunk[self.numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan) - self._shift
+            self._update_numeric(np.asfortranarray(values))
+
+        codes = {}
+        for col in list(self.categorical_cols):
+            col_codes = self._encode(col, chunk[col])
+            if col_codes is None:
+                self._drop_categorical(col)
+            else:
+                codes[col] = col_codes
+
+        self._update_categorical(codes)
+        if self.numeric_cols:
+            self._update_mixed(codes, values)
+        return self
+
+    def _blocks(self, p):
+        return [slice(start, min(start + self.block_size, p)) for start in range(0, p, self.block_size)]
+
+    def _update_numeric(self, X):
+        """Accumulate pairwise-complete moment sums over upper-triangle column blocks"""
+        present = ~np.isnan(X)
+        X0 = np.where(present, X, 0.0)
+        X0_sq = X0 * X0
+        has_missing = not present.all()
+        M = present.astype(np.float64) if has_missing else None
+
+        blocks = self._blocks(X.shape[1])
+        for i, bi in enumerate(blocks):
+            for bj in blocks[i:]:
+                self._sxy[bi, bj] += X0[:, bi].T @ X0[:, bj]
+                if has_missing:
+                    self._n[bi, bj] += M[:, bi].T @ M[:, bj]
+                    self._sx[bi, bj] += X0[:, bi].T @ M[:, bj]
+                    self._sy[bi, bj] += M[:, bi].T @ X0[:, bj]
+                    self._sxx[bi, bj] += X0_sq[:, bi].T @ M[:, bj]
+                    self._syy[bi, bj] += M[:, bi].T @ X0_sq[:, bj]
+                else:
+                    self._n[bi, bj] += len(X0)
+                    self._sx[bi, bj] += X0[:, bi].sum(axis=0)[:, None]
+                    self._sy[bi, bj] += X0[:, bj].sum(axis=0)[None, :]
+                    self._sxx[bi, bj] += X0_sq[:, bi].sum(axis=0)[:, None]
+                    self._syy[bi, bj] += X0_sq[:, bj].sum(axis=0)[None, :]
+
+    def _encode(self, col, series):
+        """Map values to stable integer codes (-1 for missing), None if too many"""
+        local_codes, uniques = pd.factorize(series)
+        levels = self._levels[col]
+        for value in uniques:
+            if value not in levels:
+                levels[value] = len(levels)
+        if len(levels) > self.max_categories:
+            return None
+        lookup = np.array([levels[value] for value in uniques] + [-1], dtype=np.int64)
+        return lookup[local_codes]
+
+    def _drop_categorical(self, col):
+        """Stop tracking a column whose cardinality is too high to be a category"""
+        self.categorical_cols.remove(col)
+        del self._levels[col]
+        self._tables = {pair: t for pair, t in self._tables.items() if col not in pair}
+        self._groups.pop(col, None)
+
+    @staticmethod
+    def _grow(array, shape):
+        """Zero-pad an accumulator to a larger shape"""
+        pad = [(0, target - current) for current, target in zip(array.shape, shape)]
+        return np.pad(array, pad) if any(after for _, after in pad) else array
+
+    def _update_categorical(self, codes):
+        """Accumulate contingency tables for every pair of categorical columns"""
+        cols = list(codes)
+        for i, a in enumerate(cols):
+            for b in cols[i + 1:]:
+                ka, kb = len(self._levels[a]), len(self._levels[b])
+                ca, cb = codes[a], codes[b]
+                valid = (ca >= 0) & (cb >= 0)
+                counts = np.bincount(ca[valid] * kb + cb[valid], minlength=ka * kb).reshape(ka, kb)
+                table = self._grow(self._tables.get((a, b), np.zeros((0, 0))), (ka, kb))
+                self._tables[(a, b)] = table + counts
+
+    def _update_mixed(self, codes, values):
+        """Accumulate per-category count, sum and sum of squares of every numeric column"""
+        present = ~np.isnan(values)
+        values0 = np.where(present, values, 0.0)
+        for col, col_codes in codes.items():
+            k = len(self._levels[col])
+            rows = np.flatnonzero(col_codes >= 0)
+            if len(rows) == 0:
+                continue
+            order = rows[np.argsort(col_codes[rows], kind='stable')]
+            sorted_codes = col_codes[order]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            groups = sorted_codes[starts]
+
+            stats = np.zeros((3, k, values.shape[1]))
+            stats[0, groups] = np.add.reduceat(present[order], starts, axis=0, dtype=np.float64)
+            stats[1, groups] = np.add.reduceat(values0[order], starts, axis=0)
+            stats[2, groups] = np.add.reduceat(values0[order] ** 2, starts, axis=0)
+
+            previous = self._groups.get(col, np.zeros((3, 0, values.shape[1])))
+            self._groups[col] = self._grow(previous, stats.shape) + stats
+
+    def numeric_matrix(self):
+        """Full correlation matrix of the numeric columns"""
+        n = self._n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mx, my = self._sx / n, self._sy / n
+            cov = self._sxy / n - mx * my
+            var_x = self._sxx / n - mx * mx
+            var_y = self._syy / n - my * my
+            r = cov / np.sqrt(var_x * var_y)
+        r[n < 3] = np.nan
+        r = np.triu(np.clip(r, -1, 1), 1)
+        r = r + r.T
+        np.fill_diagonal(r, 1.0)
+        return pd.DataFrame(r, index=self.numeric_cols, columns=self.numeric_cols)
+
+    def _cramers_v(self, table):
+        n = table.sum()
+        table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+        if n == 0 or min(table.shape) < 2:
+            return np.nan
+        expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+        chi2 = ((table - expected) ** 2 / expected).sum()
+        return float(np.sqrt(chi2 / (n * (min(table.shape) - 1))))
+
+    def _correlation_ratios(self, stats):
+        count, total, total_sq = stats
+        n = count.sum(axis=0)
+        grand = total.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ss_total = total_sq.sum(axis=0) - grand ** 2 / n
+            between = np.where(count > 0, total ** 2 / np.where(count > 0, count, 1), 0).sum(axis=0)
+            ss_between = between - grand ** 2 / n
+            eta = np.sqrt(np.clip(ss_between / ss_total, 0, 1))
+        eta[n < 3] = np.nan
+        return eta
+
+    def top_pairs(self, k=20):
+        """The k most strongly associated column pairs"""
+        pairs = []
+
+        p = len(self.numeric_cols or [])
+        if p > 1:
+            matrix = self.numeric_matrix().to_numpy()
+            rows, cols = np.triu_indices(p, 1)
+            r = matrix[rows, cols]
+            strength = np.where(np.isnan(r), -1, np.abs(r))
+            best = np.argsort(-strength, kind='stable')[:k]
+            for idx in best:
+                if not np.isnan(r[idx]):
+                    pairs.append((self.numeric_cols[rows[idx]], self.numeric_cols[cols[idx]],
+                                  self.method, float(r[idx])))
+
+        for (a, b), table in self._tables.items():
+            v = self._cramers_v(table)
+            if not np.isnan(v):
+                pairs.append((a, b, 'cramers_v', v))
+
+        for col, stats in self._groups.items():
+            for num_col, eta in zip(self.numeric_cols, self._correlation_ratios(stats)):
+                if not np.isnan(eta):
+                    pairs.append((col, num_col, 'correlation_ratio', float(eta)))
+
+        result = pd.DataFrame(pairs, columns=['column_a', 'column_b', 'measure', 'value'])
+        result['strength'] = result['value'].abs()
+        return result.sort_values('strength', ascending=False).head(k).reset_index(drop=True)
@@ -0,0 +1,171 @@
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+# Date grains, finest first, as pandas period frequencies
+GRAINS = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+AGGREGATIONS = ('sum', 'count', 'mean', 'min', 'max')
+
+# How each stored column merges when partial cubes are combined
+_MERGE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+class SummaryCube:
+    """Measures aggregated by dimensions and dates, built one batch at a time.
+
+    Only sums, counts, minimums and maximums are stored, at day level for
+    dates. A new batch is aggregated on its own and merged in, and coarser
+    date grains or fewer dimensions are rolled up from the stored table
+    without going back to the raw rows.
+    """
+
+    def __init__(self, dimensions, measures, date_column=None, grains=('month',),
+                 date_format=None, dayfirst=False):
+        self.dimensions = list(dimensions)
+        if not isinstance(measures, dict):
+            measures = {col: ['sum', 'mean'] for col in measures}
+        self.measures = {col: list(aggs) for col, aggs in measures.items()}
+        for col, aggs in self.measures.items():
+            unknown = set(aggs) - set(AGGREGATIONS)
+            if unknown:
+                raise ValueError(f"Unknown aggregation for {col}: {', '.join(sorted(unknown))}")
+
+        self.date_column = date_column
+        self.grains = [g for g in GRAINS if g in grains] if date_column else []
+        if date_column and len(self.grains) != len(set(grains)):
+            raise ValueError(f"Date grains must be among: {', '.join(GRAINS)}")
+        self.date_format = date_format
+        self.dayfirst = dayfirst
+
+        self.state = None
+        self.rows_seen = 0
+        self.sources = {}
+
+    @property
+    def keys(self):
+        return self.dimensions + (['day'] if self.date_column else [])
+
+    def _stored(self):
+        """Names of the stored columns and how each one merges"""
+        stored = {'rows': 'sum'}
+        for col in self.measures:
+            for stat in _MERGE:
+                stored[f"{col}__{stat}"] = _MERGE[stat]
+        return stored
+
+    def _aggregate(self, df):
+        """Partial cube of one batch"""
+        frame = df[self.dimensions].copy()
+        for col in self.measures:
+            frame[col] = pd.to_numeric(df[col], errors='coerce')
+        if self.date_column:
+            dates = pd.to_datetime(df[self.date_column], format=self.date_format,
+                                   dayfirst=self.dayfirst, errors='coerce')
+            frame['day'] = dates.dt.normalize()
+
+        named = {}
+        for col in self.measures:
+            for stat in _MERGE:
+                named[f"{col}__{stat}"] = (col, stat)
+        grouped = frame.groupby(self.keys, dropna=False, observed=True, sort=False)
+        part = grouped.agg(**named) if named else pd.DataFrame(index=grouped.size().index)
+        part.insert(0, 'rows', grouped.size())
+        return part.reset_index()
+
+    def _combine(self, parts, keys):
+        """Merge partial cubes that share the given key columns"""
+        stacked = pd.concat(parts, ignore_index=True)
+        stored = self._stored()
+        if not keys:
+            return stacked.agg(stored).to_frame().T
+        return stacked.groupby(keys, dropna=False, observed=True, sort=False).agg(stored).reset_index()
+
+    def update(self, df):
+        """Fold a batch of new rows into the cube"""
+        if len(df) == 0:
+            return self
+        part = self._aggregate(df)
+        self.state = part if self.state is None else self._combine([self.state, part], self.keys)
+        self.rows_seen += len(df)
+        return self
+
+    def update_from_csv(self, path, chunk_rows=100_000, **read_kwargs):
+        """Fold in the rows appended to a CSV file since it was last read"""
+        path = Path(path)
+        key = str(path.resolve())
+        size = path.stat().st_size
+        seen = self.sources.get(key, {'rows': 0, 'bytes': 0})
+        if size < seen['bytes']:
+            raise ValueError(f"{path.name} is smaller than when it was last read; rebuild the cube")
+
+        new_rows = 0
+        reader = pd.read_csv(path, chunksize=chunk_rows, skiprows=range(1, seen['rows'] + 1), **read_kwargs)
+        for chunk in reader:
+            self.update(chunk)
+            new_rows += len(chunk)
+        self.sources[key] = {'rows': seen['rows'] + new_rows, 'bytes': size}
+        return new_rows
+
+    def table(self, grain=None, dimensions=None):
+        """The cube rolled up to a date grain and some of the dimensions"""
+        if grain is not None and not self.date_column:
+            raise ValueError("This cube has no date column")
+        if grain is not None and grain not in GRAINS:
+            raise ValueError(f"Unknown grain: {grain}")
+        dimensions = self.dimensions if dimensions is None else list(dimensions)
+        keys = ([grain] if grain is not None else []) + dimensions
+        columns = keys + ['rows'] + [f"{col}_{agg}" for col, aggs in self.measures.items() for agg in aggs]
+        if self.state is None:
+            return pd.DataFrame(columns=columns)
+
+        state = self.state.copy()
+        if grain is not None:
+            if grain == 'day':
+                state[grain] = state['day']
+            else:
+                state[grain] = state['day'].dt.to_period(GRAINS[grain]).dt.start_time
+        rolled = self._combine([state], keys).sort_values(keys) if keys else self._combine([state], keys)
+
+        result = rolled[keys + ['rows']].copy()
+        for col, aggs in self.measures.items():
+            for agg in aggs:
+                if agg == 'mean':
+                    counts = rolled[f"{col}__count"]
+                    result[f"{col}_mean"] = rolled[f"{col}__sum"] / counts.where(counts > 0)
+                else:
+                    result[f"{col}_{agg}"] = rolled[f"{col}__{agg}"]
+        result['rows'] = result['rows'].astype('int64')
+        return result[columns].reset_index(drop=True)
+
+    def tables(self):
+        """One summary table per date grain, or a single table without dates"""
+        if not self.grains:
+            return {'summary': self.table()}
+        return {f"by_{grain}": self.table(grain) for grain in self.grains}
+
+    def export(self, out_dir, name='cube', file_format='parquet'):
+        """Write the summary tables as Parquet or CSV files"""
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown format: {file_format}")
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for suffix, table in self.tables().items():
+            path = out_dir / f"{name}_{suffix}.{file_format}"
+            if file_format == 'parquet':
+                table.to_parquet(path, index=False)
+            else:
+                table.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+    def save(self, path):
+        """Keep the cube so later runs only process new rows"""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
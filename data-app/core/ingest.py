@@ -0,0 +1,260 @@
+import io
+import json
+import os
+import pickle
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+from .loader import load_file
+
+SOURCE_COLUMN = 'source_file'
+
+# Below this much input, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 32 * 1024 ** 2
+
+
+def normalize_column(name):
+    """Matching key for a column name: 'Order Date ' and 'order_date' are the same column"""
+    return re.sub(r'[^0-9a-z]+', '_', str(name).strip().lower()).strip('_')
+
+
+def _parse_shard(task):
+    """Parse one shard; runs in a worker process"""
+    name, source = task
+    file = io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+    with file:
+        return load_file(file, name)
+
+
+def _parse_shards_to_files(jobs):
+    """Parse (name, path, out) shards from disk, pickling each frame to out.
+
+    Runs in a worker process. A shard that fails to parse pickles its
+    exception instead, for the parent to raise.
+    """
+    for name, path, out in jobs:
+        try:
+            result = _parse_shard((name, path))
+        except Exception as error:
+            result = error
+        with open(out, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _kind(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'int'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        return 'string'
+    return 'object'
+
+
+def widen_dtype(dtypes, has_gaps):
+    """Narrowest type that holds every shard's values for one column.
+
+    has_gaps means some rows will be missing (the column is absent from a
+    shard), which integers and booleans cannot hold.
+    """
+    kinds = {_kind(d) for d in dtypes}
+    if kinds == {'bool'}:
+        return np.dtype(bool) if not has_gaps else np.dtype(object)
+    if kinds == {'int'} and not has_gaps:
+        return np.dtype('int64')
+    if kinds <= {'int', 'float'}:
+        return np.dtype('float64')
+    if kinds == {'datetime'}:
+        unique = {str(d) for d in dtypes}
+        return dtypes[0] if len(unique) == 1 else np.dtype(object)
+    if kinds == {'string'}:
+        return 'str'
+    return np.dtype(object)
+
+
+def reconcile_schema(shards):
+    """Union of the shards' columns, matched by normalized name, with widened types.
+
+    Returns (columns, renames): columns maps each output name to its dtype,
+    renames maps each shard's own column names to output names.
+    """
+    names, dtypes, present, renames = {}, {}, {}, []
+    for i, df in enumerate(shards):
+        mapping = {}
+        for col in df.columns:
+            key = normalize_column(col)
+            if key in mapping.values():
+                # Two columns of one shard normalize alike; keep them apart
+                n = 2
+                while f"{key}_{n}" in mapping.values():
+                    n += 1
+                key = f"{key}_{n}"
+            mapping[col] = key
+            names.setdefault(key, str(col).strip())
+            dtypes.setdefault(key, []).append(df[col].dtype)
+            present.setdefault(key, set()).add(i)
+        renames.append(mapping)
+
+    columns = {
+        names[key]: widen_dtype(dtypes[key], len(present[key]) < len(shards))
+        for key in names
+    }
+    renames = [{col: names[key] for col, key in mapping.items()} for mapping in renames]
+    return columns, renames
+
+
+def assemble(shards, shard_names, source_column=SOURCE_COLUMN):
+    """Stack shards into one frame, filling each output column in place.
+
+    Every output column is allocated once at full length and each shard is
+    copied into its slice and then released, so there are no per-shard
+    aligned copies as with concat.
+    """
+    columns, renames = reconcile_schema(shards)
+    lengths = [len(df) for df in shards]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    total = int(offsets[-1])
+
+    data = {}
+    for name, dtype in columns.items():
+        storage = np.dtype(object) if dtype == 'str' else dtype
+        if storage.kind in 'fc':
+            data[name] = np.full(total, np.nan, dtype=storage)
+        elif storage.kind == 'M':
+            data[name] = np.full(total, np.datetime64('NaT'), dtype=storage)
+        elif storage == object:
+            data[name] = np.full(total, np.nan, dtype=object)
+        else:
+            data[name] = np.empty(total, dtype=storage)
+
+    summary = []
+    for i, name in enumerate(_unique_labels(shard_names)):
+        df, mapping = shards[i], renames[i]
+        start, end = offsets[i], offsets[i + 1]
+        for col, target in mapping.items():
+            values = df[col].to_numpy(dtype=data[target].dtype, na_value=_na_for(data[target].dtype))
+            data[target][start:end] = values
+        summary.append({
+            'file': name,
+            'rows': lengths[i],
+            'columns': len(mapping),
+            'renamed': ', '.join(f"{c} → {t}" for c, t in mapping.items() if str(c) != t),
+            'missing': ', '.join(c for c in columns if c not in mapping.values())
+        })
+        shards[i] = None
+
+    result = pd.DataFrame(data, copy=False)
+    for name, dtype in columns.items():
+        if dtype == 'str':
+            result[name] = result[name].astype('str')
+    if source_column:
+        # One small code per row instead of a repeated file name
+        codes = np.repeat(np.arange(len(shard_names)), lengths)
+        result[source_column] = pd.Categorical.from_codes(codes, categories=_unique_labels(shard_names))
+    return result, pd.DataFrame(summary)
+
+
+def _unique_labels(names):
+    """File names, numbered where the same name was uploaded twice"""
+    seen, labels = {}, []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        labels.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    return labels
+
+
+def _na_for(dtype):
+    if dtype.kind in 'fc':
+        return np.nan
+    if dtype.kind == 'M':
+        return np.datetime64('NaT')
+    if dtype == object:
+        return np.nan
+    return pd.api.extensions.no_default
+
+
+def ingest(tasks, workers=None, source_column=SOURCE_COLUMN, parallel_min_bytes=PARALLEL_MIN_BYTES):
+    """Parse (name, bytes or path) shards, in worker processes when large, and stack them"""
+    sizes = [len(src) if isinstance(src, bytes) else os.path.getsize(src) for _, src in tasks]
+    workers = workers or os.cpu_count() or 1
+    if len(tasks) > 1 and workers > 1 and sum(sizes) >= parallel_min_bytes:
+        shards = _parse_in_workers(tasks, min(workers, len(tasks)))
+    else:
+        shards = [_parse_shard(task) for task in tasks]
+    return assemble(shards, [name for name, _ in tasks], source_column)
+
+
+def _parse_in_workers(tasks, workers):
+    """Parse shards in worker processes, passing them to and fro as private files"""
+    shards = []
+    with tempfile.TemporaryDirectory(prefix='data-app-ingest-') as scratch:
+        jobs = []
+        for i, (name, source) in enumerate(tasks):
+            if isinstance(source, bytes):
+                # Workers read uploads from disk instead of receiving them pickled
+                path = os.path.join(scratch, f"{i}.in")
+                with open(path, 'wb') as f:
+                    f.write(source)
+                source = path
+            jobs.append((name, source, os.path.join(scratch, f"{i}.pkl")))
+
+        # Fresh interpreters running this module: forking the threaded server
+        # can copy a held lock into the child, and multiprocessing's spawn
+        # would re-run the Streamlit script, which is registered as __main__
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(
+            filter(None, [str(Path(__file__).resolve().parents[1]), os.environ.get('PYTHONPATH')])
+        )}
+        processes = []
+        for i in range(workers):
+            job_file = os.path.join(scratch, f"worker-{i}.json")
+            with open(job_file, 'w') as f:
+                json.dump(jobs[i::workers], f)
+            processes.append(subprocess.Popen([sys.executable, '-m', __name__, job_file], env=env,
+                                              stderr=subprocess.PIPE))
+        for process in processes:
+            _, stderr = process.communicate()
+            if process.returncode:
+                raise RuntimeError(f"Shard worker failed: {stderr.decode(errors='replace').strip()}")
+
+        # Parsed frames come back through files rather than a pipe, so the
+        # parent never holds a shard's pickled bytes and its frame at once
+        for _, _, out in jobs:
+            with open(out, 'rb') as f:
+                result = pickle.load(f)
+            os.remove(out)
+            if isinstance(result, Exception):
+                raise result
+            shards.append(result)
+    return shards
+
+
+def ingest_uploads(uploaded_files, **kwargs):
+    """Combine several uploaded files into one dataset"""
+    return ingest([(f.name, f.getvalue()) for f in uploaded_files], **kwargs)
+
+
+def ingest_paths(paths, **kwargs):
+    """Combine several files on disk into one dataset"""
+    return ingest([(Path(p).name, str(p)) for p in paths], **kwargs)
+
+
+def common_name(filenames):
+    """Feed name shared by shard files, e.g. 'sales' for sales_2024-01-01.csv, ..."""
+    stems = [Path(name).stem for name in filenames]
+    prefix = os.path.commonprefix(stems).rstrip('_- .0123456789')
+    return prefix or 'combined'
+
+
+if __name__ == '__main__':
+    with open(sys.argv[1]) as f:
+        _parse_shards_to_files(json.load(f))
@@ -0,0 +1,201 @@
+import pandas as pd
+import numpy as np
+
+
+class CleaningLineage:
+    """Record what every cleaning step did to the rows and cells of a dataset.
+
+    Rows are tracked by their position in the original frame, so a step's
+    removed or changed rows can be looked up later without diffing frames.
+    """
+
+    def __init__(self, df):
+        self.source = frame_fingerprint(df)
+        self.original_rows = len(df)
+        self.steps = []
+        self._positions = np.arange(len(df))
+        self._null_counts = df.isnull().sum()
+        self.missing_before = int(self._null_counts.sum())
+        # Duplicate counts come from a deduplication step where there is one;
+        # count_duplicates() fills in the rest when they are first needed
+        self.duplicates_before = None
+        self.duplicates_after = None
+        self._unique = False
+        self.final_rows = self.original_rows
+        self.missing_after = self.missing_before
+
+    def record(self, step, before, after, keep=None, columns=None, fills_only=False, deduplicates=False):
+        """Record one step; `keep` is the row mask of a pure row-removal step.
+        
+        A step that knows which columns it may have changed passes them as
+        `columns`, and one that only fills missing cells sets `fills_only`,
+        so the rest is not compared cell by cell. `deduplicates` marks a
+        step whose `keep` drops exactly the duplicate rows.
+        """
+        entry = {
+            'step': step,
+            'rows_in': len(before),
+            'rows_out': len(after),
+            'removed': np.array([], dtype=np.int64),
+            'changed': np.array([], dtype=np.int64),
+            'cells_changed': 0,
+            'filled': {}
+        }
+
+        if keep is not None:
+            keep = np.asarray(keep, dtype=bool)
+            dropped = ~keep
+            if dropped.any():
+                self._null_counts = self._null_counts.sub(
+                    before[dropped].isnull().sum(), fill_value=0
+                )
+            entry['removed'] = self._positions[dropped]
+            self._positions = self._positions[keep]
+            if deduplicates:
+                if not self.steps:
+                    self.duplicates_before = len(entry['removed'])
+                self._unique = True
+        else:
+            changed_rows, cells, filled = self._diff_cells(before, after, columns, fills_only)
+            entry['changed'] = self._positions[changed_rows]
+            entry['cells_changed'] = cells
+            entry['filled'] = filled
+            # Changed cells can make rows equal again
+            self._unique = self._unique and not cells
+
+        survivors = np.zeros(self.original_rows, dtype=bool)
+        survivors[self._positions] = True
+        entry['survivors'] = np.packbits(survivors)
+
+        self.steps.append(entry)
+        self.missing_after = int(self._null_counts.sum())
+        self.final_rows = len(self._positions)
+        return entry
+
+    def _diff_cells(self, before, after, columns=None, fills_only=False):
+        """Compare two row-aligned frames column by column"""
+        changed_rows = np.zeros(len(after), dtype=bool)
+        cells = 0
+        filled = {}
+
+        for col in after.columns if columns is None else columns:
+            if col not in before.columns or col not in after.columns:
+                continue
+            if fills_only and not self._null_counts.get(col, 0):
+                # Nothing to fill in this column
+                continue
+            b, a = before[col], after[col]
+            if _shares_data(b, a):
+                continue
+            b_null = b.isna().to_numpy()
+            a_null = a.isna().to_numpy()
+
+            diff = b_null != a_null
+            both = ~b_null & ~a_null
+            if fills_only:
+                pass
+            elif b.dtype != a.dtype:
+                diff |= both
+            elif both.any():
+                diff[both] = b[both].to_numpy() != a[both].to_numpy()
+
+            n_filled = int((b_null & ~a_null).sum())
+            if n_filled:
+                filled[col] = n_filled
+            self._null_counts[col] = int(a_null.sum())
+
+            cells += int(diff.sum())
+            changed_rows |= diff
+
+        return changed_rows, cells, filled
+
+    def matches(self, df):
+        """Whether df is the frame this lineage was recorded on"""
+        return frame_fingerprint(df) == self.source
+
+    def finish(self, df):
+        """Close the lineage on the final frame"""
+        if self._unique:
+            self.duplicates_after = 0
+        self.final_rows = len(df)
+        return self
+
+    def count_duplicates(self, original_df, cleaned_df):
+        """Duplicate rows before and after cleaning, counting only what no step recorded"""
+        if self.duplicates_before is None:
+            self._check_source(original_df)
+            self.duplicates_before = int(original_df.duplicated().sum())
+        if self.duplicates_after is None:
+            self.duplicates_after = int(cleaned_df.duplicated().sum())
+        return self.duplicates_before, self.duplicates_after
+
+    def survivors(self, step_index):
+        """Boolean mask over the original rows still present after a step"""
+        packed = self.steps[step_index]['survivors']
+        return np.unpackbits(packed, count=self.original_rows).astype(bool)
+
+    def summary(self):
+        """Per-step table of rows removed and cells changed"""
+        return pd.DataFrame([{
+            'Step': entry['step'],
+            'Rows In': entry['rows_in'],
+            'Rows Out': entry['rows_out'],
+            'Rows Removed': len(entry['removed']),
+            'Rows Changed': len(entry['changed']),
+            'Cells Changed': entry['cells_changed']
+        } for entry in self.steps])
+
+    def filled_counts(self):
+        """Per-step, per-column count of missing values that were filled"""
+        rows = []
+        for entry in self.steps:
+            for col, count in entry['filled'].items():
+                rows.append({'Step': entry['step'], 'Column': col, 'Filled': count})
+        return pd.DataFrame(rows, columns=['Step', 'Column', 'Filled'])
+
+    def removed_rows(self, original_df, step_index):
+        """Original rows that a step removed"""
+        self._check_source(original_df)
+        return original_df.iloc[self.steps[step_index]['removed']]
+
+    def changed_rows(self, original_df, step_index):
+        """Original rows in which a step changed at least one cell"""
+        self._check_source(original_df)
+        return original_df.iloc[self.steps[step_index]['changed']]
+
+    def _check_source(self, df):
+        # Row positions only mean something in the frame they were recorded on
+        if not self.matches(df):
+            raise ValueError("This lineage was recorded on a different dataset")
+
+
+def _buffers(series):
+    """Addresses of the memory behind a column, or None when it cannot be told"""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        values = series.to_numpy()
+        return (values.__array_interface__['data'][0], values.strides)
+    if isinstance(dtype, pd.ArrowDtype) or getattr(dtype, 'storage', None) == 'pyarrow':
+        chunks = series.array.__arrow_array__().chunks
+        return tuple((chunk.offset, tuple(buf.address if buf is not None else None for buf in chunk.buffers()))
+                     for chunk in chunks)
+    return None
+
+
+def _shares_data(before, after):
+    """Whether a step left a column as it was, sharing its memory"""
+    if before.dtype != after.dtype or len(before) != len(after):
+        return False
+    buffers = _buffers(before)
+    return buffers is not None and buffers == _buffers(after)
+
+
+def frame_fingerprint(df, sample_rows=1000):
+    """Cheap identity of a frame: shape, columns, dtypes and a hash of spread-out rows"""
+    positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), sample_rows)).astype(np.int64))
+    try:
+        rows = int(pd.util.hash_pandas_object(df.iloc[positions], index=True).sum())
+    except TypeError:
+        # Unhashable cells such as lists; shape and columns still tell frames apart
+        rows = None
+    return (len(df), tuple(map(str, df.columns)), tuple(map(str, df.dtypes)), rows)
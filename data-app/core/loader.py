@@ -0,0 +1,132 @@
+import pandas as pd
+import numpy as np
+
+# Rows buffered as Python objects before they are converted to typed columns
+BATCH_ROWS = 50_000
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+
+def is_excel(filename):
+    return filename.lower().endswith(('.xlsx', '.xls'))
+
+
+def list_sheets(file):
+    """List the sheet names of a workbook without parsing any cells"""
+    file.seek(0)
+    if CalamineWorkbook is not None:
+        return CalamineWorkbook.from_filelike(file).sheet_names
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(file, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def _iter_sheet_rows(file, sheet):
+    """Yield the raw cell values of a sheet row by row"""
+    file.seek(0)
+    if CalamineWorkbook is not None:
+        workbook = CalamineWorkbook.from_filelike(file)
+        yield from workbook.get_sheet_by_name(sheet or workbook.sheet_names[0]).iter_rows()
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _header(row):
+    """Column names from a header row, with blanks and repeats made unique"""
+    names = []
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None or value == '' else str(value)
+        base, n = name, 1
+        while name in names:
+            name = f"{base}.{n}"
+            n += 1
+        names.append(name)
+    return names
+
+
+def _typed_batch(rows, width):
+    """Typed column values of a batch of raw rows; None for a column blank throughout"""
+    batch = []
+    for values in zip(*rows) if rows else [()] * width:
+        # Calamine reports blank cells as empty strings
+        series = pd.Series([None if value == '' else value for value in values])
+        batch.append(None if series.isna().all() else series)
+    return batch
+
+
+def _stack_column(pieces, lengths):
+    """One column from its typed batches, widened to a type that holds them all"""
+    from .ingest import widen_dtype
+
+    dtypes = [piece.dtype for piece in pieces if piece is not None]
+    if not dtypes:
+        return pd.Series(np.nan, index=pd.RangeIndex(sum(lengths)))
+    # A blank batch is a gap, as a column missing from a shard is
+    dtype = widen_dtype(dtypes, any(piece is None for piece in pieces))
+    pieces = [
+        pd.Series([None] * length, dtype=dtype) if piece is None else piece.astype(dtype, copy=False)
+        for piece, length in zip(pieces, lengths)
+    ]
+    return pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+
+
+def read_excel_sheet(file, sheet=None, batch_rows=BATCH_ROWS):
+    """Read a sheet into one frame, converting every batch_rows rows to typed columns.
+
+    Each batch is inferred on its own and the batches of a column are then
+    widened to one type, so a column that is blank for a whole batch keeps
+    the type of its other values.
+    """
+    rows = iter(_iter_sheet_rows(file, sheet))
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    columns = _header(header)
+    width = len(columns)
+
+    batches, lengths, batch = [], [], []
+    for row in rows:
+        if all(value is None or value == '' for value in row):
+            continue
+        batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+        if len(batch) >= batch_rows:
+            batches.append(_typed_batch(batch, width))
+            lengths.append(len(batch))
+            batch = []
+    if batch or not batches:
+        batches.append(_typed_batch(batch, width))
+        lengths.append(len(batch))
+
+    df = pd.DataFrame(index=pd.RangeIndex(sum(lengths)))
+    for i, name in enumerate(columns):
+        df[name] = _stack_column([pieces[i] for pieces in batches], lengths)
+        for pieces in batches:
+            pieces[i] = None
+    return df
+
+
+def load_file(file, filename, sheet=None):
+    """Load a CSV or Excel upload into one frame"""
+    if not is_excel(filename):
+        # Whole-file parsing keeps CSV type inference consistent across rows
+        file.seek(0)
+        return pd.read_csv(file)
+    if filename.lower().endswith('.xls') and CalamineWorkbook is None:
+        # openpyxl cannot read legacy .xls workbooks
+        file.seek(0)
+        return pd.read_excel(file, sheet_name=sheet or 0)
+    return read_excel_sheet(file, sheet)
@@ -0,0 +1,273 @@
+import atexit
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+
+# pandas and numpy are imported where frames are handled, so that the app
+# can create its governor without loading them on the first page
+
+MB = 1024 * 1024
+
+# Extra working memory of each operation, as a fraction of the input frame.
+# Cleaning operations also allocate an output frame about the size of the input.
+OPERATION_OVERHEAD = {
+    'analyze': 1.0,
+    'remove_duplicates': 0.5,
+    'handle_missing': 1.0,
+    'remove_outliers': 0.25,
+    'standardize_text': 2.0,
+    'convert_types': 1.0
+}
+READ_ONLY_OPERATIONS = {'analyze'}
+
+# Parsed frames are usually larger than the file they came from
+LOAD_EXPANSION = 3.0
+EXCEL_LOAD_EXPANSION = 10.0
+MIN_CHUNK_ROWS = 10_000
+SAMPLE_ROWS = 1000
+
+
+class MemoryBudgetError(MemoryError):
+    """Raised when an operation cannot fit the memory budget even in chunks"""
+
+
+def estimate_frame_bytes(df):
+    """Estimate the in-memory size of a frame from its dtypes and row count"""
+    import numpy as np
+
+    rows = len(df)
+    total = 0
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if isinstance(col.dtype, np.dtype) and col.dtype != object:
+            total += col.dtype.itemsize * rows
+        elif rows:
+            # Variable-width values: scale up a sample's deep size
+            sample = col.head(SAMPLE_ROWS)
+            total += int(sample.memory_usage(deep=True, index=False) / len(sample) * rows)
+    return total + df.index.memory_usage()
+
+
+def estimate_bytes(value):
+    """Size of a stored value: frames are estimated, other objects report nbytes"""
+    if value is None:
+        return 0
+    if hasattr(value, 'dtypes'):
+        return estimate_frame_bytes(value)
+    return int(getattr(value, 'nbytes', 0))
+
+
+def estimate_operation_bytes(df, operation, chunk_rows=None):
+    """Estimate the extra memory an operation needs on top of its input"""
+    frame_bytes = estimate_frame_bytes(df)
+    overhead = OPERATION_OVERHEAD.get(operation, 1.0)
+    output = 0 if operation in READ_ONLY_OPERATIONS else frame_bytes
+
+    if chunk_rows is None or chunk_rows >= len(df):
+        return int(output + frame_bytes * overhead)
+    row_bytes = frame_bytes / max(len(df), 1)
+    return int(output + row_bytes * chunk_rows * overhead)
+
+
+class SessionFrames:
+    """The frames one user session keeps between reruns.
+
+    Other large per-dataset objects, such as a FrameIndex, can be kept here
+    too; they are budgeted by their nbytes and spilled like frames.
+    """
+
+    def __init__(self, governor, session_id):
+        self._governor = governor
+        self.session_id = session_id
+        self._frames = {}
+        self._sizes = {}
+        self._spilled = {}
+        self.last_seen = time.time()
+
+    def __getitem__(self, name):
+        if name in self._spilled:
+            self._governor.restore(self, name)
+        return self._frames[name]
+
+    def __setitem__(self, name, df):
+        with self._governor.lock:
+            self._drop_spill(name)
+            self._frames[name] = df
+            self._sizes[name] = estimate_bytes(df)
+
+    def __contains__(self, name):
+        return name in self._frames or name in self._spilled
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def pop(self, name):
+        with self._governor.lock:
+            self._drop_spill(name)
+            self._sizes.pop(name, None)
+            return self._frames.pop(name, None)
+
+    def resident_bytes(self):
+        return sum(self._sizes.values())
+
+    def _drop_spill(self, name):
+        path = self._spilled.pop(name, None)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+class MemoryGovernor:
+    """Keep the app's dataframes inside per-session and global memory budgets.
+
+    Every planned operation is checked against the budgets. Operations that
+    do not fit run in row chunks, and frames of idle sessions are spilled to
+    local disk when the process runs short.
+    """
+
+    def __init__(self, session_budget_mb=1024, global_budget_mb=4096,
+                 idle_seconds=300, expire_seconds=24 * 3600, spill_dir=None):
+        self.session_budget = int(session_budget_mb * MB)
+        self.global_budget = int(global_budget_mb * MB)
+        self.idle_seconds = idle_seconds
+        self.expire_seconds = expire_seconds
+        # A private folder (mode 0700) per process, so other local users can
+        # neither read spilled frames nor plant pickles for restore() to load
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = tempfile.mkdtemp(prefix='data-app-spill-', dir=spill_dir)
+        atexit.register(shutil.rmtree, self.spill_dir, True)
+        self.lock = threading.RLock()
+        self._sessions = {}
+
+    @classmethod
+    def from_env(cls):
+        """Build a governor from DATA_APP_* environment variables"""
+        return cls(
+            session_budget_mb=float(os.environ.get('DATA_APP_SESSION_BUDGET_MB', 1024)),
+            global_budget_mb=float(os.environ.get('DATA_APP_GLOBAL_BUDGET_MB', 4096)),
+            idle_seconds=float(os.environ.get('DATA_APP_IDLE_SECONDS', 300)),
+            spill_dir=os.environ.get('DATA_APP_SPILL_DIR')
+        )
+
+    def session(self, session_id):
+        """Return a session's frames and mark the session as active"""
+        with self.lock:
+            self._expire()
+            frames = self._sessions.get(session_id)
+            if frames is None:
+                frames = SessionFrames(self, session_id)
+                self._sessions[session_id] = frames
+            frames.last_seen = time.time()
+            return frames
+
+    def session_usage(self, session_id):
+        frames = self._sessions.get(session_id)
+        return frames.resident_bytes() if frames else 0
+
+    def global_usage(self):
+        return sum(frames.resident_bytes() for frames in self._sessions.values())
+
+    def _free_bytes(self, session_id):
+        return min(
+            self.session_budget - self.session_usage(session_id),
+            self.global_budget - self.global_usage()
+        )
+
+    def plan(self, session_id, df, operation):
+        """Decide how to run an operation on df.
+
+        Returns a dict with 'mode' ('memory' or 'chunked'), 'chunk_rows' and
+        'estimated_bytes'. Raises MemoryBudgetError if nothing fits.
+        """
+        with self.lock:
+            need = estimate_operation_bytes(df, operation)
+            self._relieve(need, keep=session_id)
+            free = self._free_bytes(session_id)
+            if need <= free:
+                return {'mode': 'memory', 'chunk_rows': None, 'estimated_bytes': need}
+
+            if operation not in READ_ONLY_OPERATIONS:
+                frame_bytes = estimate_frame_bytes(df)
+                row_bytes = frame_bytes / max(len(df), 1)
+                overhead = OPERATION_OVERHEAD.get(operation, 1.0)
+                headroom = free - frame_bytes
+                chunk_rows = int(headroom / max(row_bytes * overhead, 1))
+                if chunk_rows >= MIN_CHUNK_ROWS:
+                    return {
+                        'mode': 'chunked',
+                        'chunk_rows': chunk_rows,
+                        'estimated_bytes': estimate_operation_bytes(df, operation, chunk_rows)
+                    }
+
+            raise MemoryBudgetError(
+                f"'{operation}' needs about {need / MB:,.0f} MB but only "
+                f"{max(free, 0) / MB:,.0f} MB of the memory budget is free"
+            )
+
+    def check_load(self, session_id, file_bytes, expansion=LOAD_EXPANSION):
+        """Refuse an upload whose parsed frame would not fit the budget"""
+        with self.lock:
+            need = int(file_bytes * expansion)
+            self._relieve(need, keep=session_id)
+            free = self._free_bytes(session_id)
+            if need > free:
+                raise MemoryBudgetError(
+                    f"This file needs about {need / MB:,.0f} MB once loaded but only "
+                    f"{max(free, 0) / MB:,.0f} MB of the memory budget is free"
+                )
+            return need
+
+    def _relieve(self, need, keep=None):
+        """Spill idle sessions, least recently seen first, until need fits"""
+        if self.global_usage() + need <= self.global_budget:
+            return
+        now = time.time()
+        idle = sorted(
+            (frames for sid, frames in self._sessions.items()
+             if sid != keep and now - frames.last_seen >= self.idle_seconds),
+            key=lambda frames: frames.last_seen
+        )
+        for frames in idle:
+            for name, df in list(frames._frames.items()):
+                if df is not None:
+                    self.spill(frames, name)
+            if self.global_usage() + need <= self.global_budget:
+                return
+
+    def spill(self, frames, name):
+        """Move one of a session's frames to local disk"""
+        with self.lock:
+            df = frames._frames.pop(name)
+            frames._sizes.pop(name, None)
+            session_dir = os.path.join(self.spill_dir, frames.session_id)
+            os.makedirs(session_dir, mode=0o700, exist_ok=True)
+            path = os.path.join(session_dir, f"{name}.pkl")
+            with open(path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            frames._spilled[name] = path
+
+    def restore(self, frames, name):
+        """Load a spilled frame back into memory"""
+        with self.lock:
+            import pandas as pd
+
+            path = frames._spilled.pop(name)
+            if os.path.dirname(os.path.dirname(path)) != self.spill_dir:
+                raise ValueError(f"Refusing to load a spilled frame from outside {self.spill_dir}")
+            df = pd.read_pickle(path)
+            os.remove(path)
+            size = estimate_bytes(df)
+            self._relieve(size, keep=frames.session_id)
+            frames._frames[name] = df
+            frames._sizes[name] = size
+
+    def _expire(self):
+        """Forget sessions that have not been seen for a long time"""
+        now = time.time()
+        for sid, frames in list(self._sessions.items()):
+            if now - frames.last_seen >= self.expire_seconds:
+                del self._sessions[sid]
+                shutil.rmtree(os.path.join(self.spill_dir, sid), ignore_errors=True)
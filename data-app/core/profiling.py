@@ -0,0 +1,240 @@
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _is_frame(value):
+    """Whether value is a DataFrame or Series, without importing pandas"""
+    return type(value).__name__ in ('DataFrame', 'Series') and hasattr(value, 'shape')
+
+
+def _shape(value):
+    """(rows, columns) of a frame or series, else (None, None)"""
+    if not _is_frame(value):
+        return None, None
+    if len(value.shape) == 1:
+        return value.shape[0], 1
+    return value.shape
+
+
+class Profiler:
+    """Record wall time, CPU time, peak memory and frame sizes of instrumented calls.
+
+    Recording is on for every thread when `enabled` is set, or only for the
+    current thread between start_capture() and stop_capture(). When neither
+    applies an instrumented call costs one flag check.
+
+    Calls are only timed by default. Peak memory is an opt-in, separate mode
+    (`trace_memory`, or start_capture(memory=True)) because tracemalloc slows
+    the traced code down and is process-wide: while it runs every thread pays
+    for it and a peak covers every thread allocating during the call. Traced
+    calls take turns so they do not reset each other's peaks.
+    """
+
+    def __init__(self, max_events=1000):
+        self.enabled = False
+        self.trace_memory = False
+        self.events = deque(maxlen=max_events)
+        self.totals = {}
+        self._listeners = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._memory_lock = threading.RLock()
+        self._active_calls = 0
+        self._owns_tracing = False
+
+    def is_recording(self):
+        return self.enabled or getattr(self._local, 'captured', None) is not None
+
+    def subscribe(self, callback):
+        """Call callback(event) for every recorded event"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def start_capture(self, memory=False):
+        """Record calls made by this thread until stop_capture(), with peak memory if asked"""
+        self._local.captured = []
+        self._local.memory = memory
+        return self._local.captured
+
+    def stop_capture(self):
+        """Stop recording this thread and return its events"""
+        captured = getattr(self._local, 'captured', None) or []
+        self._local.captured = None
+        self._local.memory = False
+        return captured
+
+    def traces_memory(self):
+        return self.trace_memory or getattr(self._local, 'memory', False)
+
+    def call(self, name, func, args, kwargs):
+        """Run func and record one event for it"""
+        if self.traces_memory():
+            with self._memory_lock:
+                return self._traced_call(name, func, args, kwargs)
+
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        result = func(*args, **kwargs)
+        wall = time.perf_counter() - wall_start
+        cpu = time.thread_time() - cpu_start
+        self._emit(self._event(name, args, result, wall, cpu, None))
+        return result
+
+    def _traced_call(self, name, func, args, kwargs):
+        """Run func under tracemalloc and record its peak memory too"""
+        stack = self._memory_stack()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        stack.append({'start': current, 'peak': current})
+
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            frame = stack.pop()
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            else:
+                self._stop_tracing()
+
+        self._emit(self._event(name, args, result, wall, cpu, peak - frame['start']))
+        return result
+
+    def _event(self, name, args, result, wall, cpu, peak_memory):
+        source = args[0].df if args and hasattr(args[0], 'df') else None
+        frames = [a for a in args[1:] if _is_frame(a)]
+        rows_in, cols_in = _shape(frames[0] if frames else source)
+        rows_out, cols_out = _shape(result)
+        return {
+            'operation': name,
+            'timestamp': time.time(),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'peak_memory_bytes': peak_memory,
+            'rows_in': rows_in,
+            'cols_in': cols_in,
+            'rows_out': rows_out,
+            'cols_out': cols_out
+        }
+
+    def _memory_stack(self):
+        """Per-thread stack of memory baselines, so nested calls nest their peaks"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        if not stack:
+            self._start_tracing()
+        return stack
+
+    def _start_tracing(self):
+        # tracemalloc is process-wide, so it runs while any thread is in a call
+        with self._lock:
+            if self._active_calls == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+            self._active_calls += 1
+
+    def _stop_tracing(self):
+        with self._lock:
+            self._active_calls -= 1
+            if self._active_calls == 0 and self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def _emit(self, event):
+        with self._lock:
+            self.events.append(event)
+            total = self.totals.setdefault(event['operation'], {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                'rows_in': 0, 'rows_out': 0, 'peak_memory_bytes': 0
+            })
+            total['calls'] += 1
+            total['wall_seconds'] += event['wall_seconds']
+            total['cpu_seconds'] += event['cpu_seconds']
+            total['rows_in'] += event['rows_in'] or 0
+            total['rows_out'] += event['rows_out'] or 0
+            total['peak_memory_bytes'] = max(total['peak_memory_bytes'], event['peak_memory_bytes'] or 0)
+
+        captured = getattr(self._local, 'captured', None)
+        if captured is not None:
+            captured.append(event)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def to_frame(self, events=None):
+        """Events as a table"""
+        import pandas as pd
+        return pd.DataFrame(list(self.events if events is None else events))
+
+    def prometheus_text(self):
+        """Totals per operation in the Prometheus text exposition format"""
+        metrics = [
+            ('data_app_calls_total', 'counter', 'Instrumented calls', 'calls'),
+            ('data_app_wall_seconds_total', 'counter', 'Wall time spent', 'wall_seconds'),
+            ('data_app_cpu_seconds_total', 'counter', 'CPU time spent', 'cpu_seconds'),
+            ('data_app_rows_in_total', 'counter', 'Rows passed in', 'rows_in'),
+            ('data_app_rows_out_total', 'counter', 'Rows returned', 'rows_out'),
+            ('data_app_peak_memory_bytes', 'gauge', 'Largest traced memory peak of one call', 'peak_memory_bytes')
+        ]
+        with self._lock:
+            totals = {name: dict(total) for name, total in self.totals.items()}
+
+        lines = []
+        for metric, kind, help_text, key in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, total in sorted(totals.items()):
+                lines.append(f'{metric}{{operation="{name}"}} {total[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def serve_metrics(self, port, host='127.0.0.1'):
+        """Serve prometheus_text() on http://host:port/metrics in a daemon thread"""
+        profiler = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = profiler.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+profiler = Profiler()
+profiler.enabled = os.environ.get('DATA_APP_PROFILE', '') not in ('', '0')
+profiler.trace_memory = os.environ.get('DATA_APP_PROFILE_MEMORY', '') not in ('', '0')
+
+
+def instrument(func):
+    """Record every call of a DataAnalyzer or DataCleaner method with the profiler"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiler.is_recording():
+            return func(*args, **kwargs)
+        return profiler.call(name, func, args, kwargs)
+
+    return wrapper
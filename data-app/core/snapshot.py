@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+SNAPSHOT_VERSION = 2
+QUANTILE_POINTS = 101
+TOP_K = 20
+PSI_BINS = 10
+
+# Default thresholds for flagging a column as drifted
+PSI_THRESHOLD = 0.2
+KS_THRESHOLD = 0.1
+NULL_RATE_THRESHOLD = 0.05
+CARDINALITY_THRESHOLD = 0.5
+
+# Keeps log terms finite when a bin is empty on one side
+_EPSILON = 1e-4
+
+
+def _kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return 'categorical'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'categorical'
+
+
+def _number(value):
+    """JSON-safe float"""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def schema_fingerprint(schema):
+    """Short hash of the ordered column names and types"""
+    payload = json.dumps([[name, dtype] for name, dtype in schema])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _value_key(value):
+    """Stable stand-in for a raw value, so top values can be compared without being stored"""
+    return hashlib.sha256(str(value).encode('utf-8')).hexdigest()[:16]
+
+
+def _profile_column(series, top_k, quantile_points, raw_values=False):
+    """Stats, a quantile sketch or top values for one column"""
+    kind = _kind(series)
+    values = series.dropna()
+    profile = {
+        'dtype': str(series.dtype),
+        'kind': kind,
+        'count': int(len(series)),
+        'null_rate': _number(1 - len(values) / len(series)) if len(series) else 0.0,
+        'distinct': int(values.nunique())
+    }
+
+    if kind in ('numeric', 'datetime') and len(values):
+        # Datetimes are sketched as seconds since the epoch
+        if kind == 'datetime':
+            numbers = (values - values.min()).dt.total_seconds() + values.min().timestamp()
+        else:
+            numbers = values.astype('float64')
+        numbers = numbers[np.isfinite(numbers)]
+        if len(numbers):
+            profile.update({
+                'mean': _number(numbers.mean()),
+                'std': _number(numbers.std()),
+                'quantiles': [_number(q) for q in np.quantile(numbers, np.linspace(0, 1, quantile_points))]
+            })
+    elif kind == 'categorical' and len(values):
+        counts = values.astype(str).value_counts()
+        key = str if raw_values else _value_key
+        profile['top_values'] = 'raw' if raw_values else 'sha256'
+        profile['top'] = {key(k): int(v) for k, v in counts.head(top_k).items()}
+        profile['other'] = int(counts.iloc[top_k:].sum())
+    return profile
+
+
+class ProfileSnapshot:
+    """Compact, saveable profile of a dataset for later drift checks"""
+
+    def __init__(self, columns, rows, name=None, created=None):
+        self.columns = columns
+        self.rows = rows
+        self.name = name
+        self.created = created or datetime.now().isoformat(timespec='seconds')
+
+    @classmethod
+    def from_frame(cls, df, name=None, top_k=TOP_K, quantile_points=QUANTILE_POINTS, raw_values=False):
+        """Profile every column of a frame.
+
+        Top categorical values are kept as hashes unless raw_values is set,
+        so a saved snapshot does not hold the data itself.
+        """
+        columns = {str(col): _profile_column(df[col], top_k, quantile_points, raw_values)
+                   for col in df.columns}
+        return cls(columns, len(df), name)
+
+    @property
+    def schema(self):
+        return [(name, profile['dtype']) for name, profile in self.columns.items()]
+
+    @property
+    def fingerprint(self):
+        return schema_fingerprint(self.schema)
+
+    def to_dict(self):
+        return {
+            'version': SNAPSHOT_VERSION,
+            'name': self.name,
+            'created': self.created,
+            'rows': self.rows,
+            'fingerprint': self.fingerprint,
+            'columns': self.columns
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['columns'], data['rows'], data.get('name'), data.get('created'))
+
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+    def summary(self):
+        """One row per column"""
+        return pd.DataFrame([
+            {
+                'column': name,
+                'type': profile['dtype'],
+                'null_rate': profile['null_rate'],
+                'distinct': profile['distinct'],
+                'mean': profile.get('mean'),
+                'median': profile['quantiles'][len(profile['quantiles']) // 2] if 'quantiles' in profile else None
+            }
+            for name, profile in self.columns.items()
+        ])
+
+
+def _cdf(sketch, x):
+    """Share of values at or below each x, read off a quantile sketch"""
+    sketch = np.asarray(sketch, dtype=float)
+    probs = np.linspace(0, 1, len(sketch))
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    idx = np.searchsorted(sketch, x, side='right')
+    result = np.where(idx >= len(sketch), 1.0, 0.0)
+    inside = (idx > 0) & (idx < len(sketch))
+    lo, hi = idx[inside] - 1, idx[inside]
+    # Interpolate between the sketch points around x
+    result[inside] = probs[lo] + (x[inside] - sketch[lo]) / (sketch[hi] - sketch[lo]) * (probs[hi] - probs[lo])
+    return result
+
+
+def _psi(expected, actual):
+    expected = np.clip(np.asarray(expected, dtype=float), _EPSILON, None)
+    actual = np.clip(np.asarray(actual, dtype=float), _EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def numeric_drift(old_sketch, new_sketch, bins=PSI_BINS):
+    """PSI over the old data's quantile bins and the KS distance, from sketches"""
+    edges = np.unique(np.quantile(old_sketch, np.linspace(0, 1, bins + 1)[1:-1]))
+    old_cdf = np.concatenate([[0.0], _cdf(old_sketch, edges), [1.0]])
+    new_cdf = np.concatenate([[0.0], _cdf(new_sketch, edges), [1.0]])
+    psi = _psi(np.diff(old_cdf), np.diff(new_cdf))
+
+    points = np.union1d(old_sketch, new_sketch)
+    ks = float(np.max(np.abs(_cdf(old_sketch, points) - _cdf(new_sketch, points))))
+    return psi, ks
+
+
+def categorical_drift(old, new):
+    """PSI over the old data's top values plus an 'other' bucket"""
+    old_total = sum(old.get('top', {}).values()) + old.get('other', 0)
+    new_total = sum(new.get('top', {}).values()) + new.get('other', 0)
+    if not old_total or not new_total:
+        return None
+    categories = list(old.get('top', {}))
+    new_top = new.get('top', {})
+    # A value outside the new top values gets the average count of the values
+    # left out, which can be no more than the least common top value
+    rest = new['distinct'] - len(new_top)
+    unseen = min(new.get('other', 0) / rest, min(new_top.values())) if rest > 0 and new_top else 0
+    expected = [old['top'][c] / old_total for c in categories]
+    actual = [new_top.get(c, unseen) / new_total for c in categories]
+    expected.append(max(0.0, 1 - sum(expected)))
+    actual.append(max(0.0, 1 - sum(actual)))
+    return _psi(expected, actual)
+
+
+def _same_keys(old, new):
+    """Whether both profiles name their top values the same way, raw or hashed"""
+    # Version 1 snapshots always kept raw values
+    return old.get('top_values', 'raw') == new.get('top_values', 'raw')
+
+
+def compare_snapshots(old, new, psi_threshold=PSI_THRESHOLD, ks_threshold=KS_THRESHOLD,
+                      null_threshold=NULL_RATE_THRESHOLD, cardinality_threshold=CARDINALITY_THRESHOLD):
+    """Schema and distribution changes between two snapshots"""
+    rows = []
+    for name in list(old.columns) + [c for c in new.columns if c not in old.columns]:
+        before, after = old.columns.get(name), new.columns.get(name)
+        row = {'column': name, 'status': 'ok', 'old_type': None, 'new_type': None,
+               'null_rate_change': None, 'distinct_change': None, 'psi': None, 'ks': None, 'reasons': []}
+        if before is None:
+            row.update(status='added', new_type=after['dtype'])
+            rows.append(row)
+            continue
+        if after is None:
+            row.update(status='removed', old_type=before['dtype'])
+            rows.append(row)
+            continue
+
+        row['old_type'], row['new_type'] = before['dtype'], after['dtype']
+        if before['dtype'] != after['dtype']:
+            row['reasons'].append(f"type {before['dtype']} → {after['dtype']}")
+
+        row['null_rate_change'] = after['null_rate'] - before['null_rate']
+        if abs(row['null_rate_change']) > null_threshold:
+            row['reasons'].append(f"null rate {before['null_rate']:.1%} → {after['null_rate']:.1%}")
+
+        row['distinct_change'] = (after['distinct'] - before['distinct']) / max(before['distinct'], 1)
+        if abs(row['distinct_change']) > cardinality_threshold:
+            row['reasons'].append(f"distinct values {before['distinct']:,} → {after['distinct']:,}")
+
+        if before['kind'] == after['kind'] and 'quantiles' in before and 'quantiles' in after:
+            row['psi'], row['ks'] = numeric_drift(before['quantiles'], after['quantiles'])
+        elif before['kind'] == after['kind'] == 'categorical' and _same_keys(before, after):
+            row['psi'] = categorical_drift(before, after)
+        if row['psi'] is not None and row['psi'] > psi_threshold:
+            row['reasons'].append(f"PSI {row['psi']:.2f}")
+        if row['ks'] is not None and row['ks'] > ks_threshold:
+            row['reasons'].append(f"KS {row['ks']:.2f}")
+
+        if row['reasons']:
+            row['status'] = 'drifted'
+        rows.append(row)
+
+    columns = pd.DataFrame(rows)
+    columns['reasons'] = columns['reasons'].str.join('; ')
+    return {
+        'schema_changed': old.fingerprint != new.fingerprint,
+        'rows_before': old.rows,
+        'rows_after': new.rows,
+        'columns': columns
+    }
+
+
+class SnapshotStore:
+    """Snapshots saved as JSON files, newest last per name"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @classmethod
+    def from_env(cls):
+        """The folder named by DATA_APP_SNAPSHOT_DIR, or one per account running the app.
+
+        Either way it outlives sessions, so next month's upload of a feed
+        finds this month's snapshot.
+        """
+        default = Path.home() / '.data-app' / 'snapshots'
+        return cls(os.environ.get('DATA_APP_SNAPSHOT_DIR', default))
+
+    def save(self, snapshot):
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stamp = snapshot.created.replace(':', '').replace('-', '')
+        path = self.directory / f"{snapshot.name or 'data'}__{stamp}.json"
+        snapshot.save(path)
+        return path
+
+    def list(self):
+        """Saved snapshot files, newest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def load(self, path):
+        return ProfileSnapshot.load(path)
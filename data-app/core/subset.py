@@ -0,0 +1,246 @@
+import pandas as pd
+import numpy as np
+
+from .profiling import instrument
+
+# Columns with up to this many values get one bitmap per value; more would
+# outweigh the column itself, so they are matched through their codes
+MAX_BITMAP_VALUES = 64
+
+OPERATORS = ('in', 'not in', 'between', '==', '!=', '<', '<=', '>', '>=', 'is null', 'not null')
+
+
+class BitmapIndex:
+    """One packed bitmap per distinct value of a low-cardinality column"""
+
+    kind = 'bitmap'
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        self.rows = len(series)
+        self.values = pd.Index(uniques)
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.bitmaps = [np.packbits(codes == i) for i in range(len(uniques))]
+        self.nulls = np.packbits(codes < 0)
+
+    @property
+    def nbytes(self):
+        arrays = self.bitmaps + [self.nulls, self.counts]
+        return sum(a.nbytes for a in arrays) + self.values.memory_usage(deep=True)
+
+    def match(self, values):
+        """Bitmap of the rows holding any of the values"""
+        result = np.zeros_like(self.nulls)
+        for i in _lookup(self.values, values):
+            result |= self.bitmaps[i]
+        return result
+
+
+class CodeIndex:
+    """Integer codes of a high-cardinality column, matched by code"""
+
+    kind = 'codes'
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        dtype = np.int32 if len(uniques) < 2 ** 31 else np.int64
+        self.rows = len(series)
+        self.codes = codes.astype(dtype, copy=False)
+        # Kept as an Index: compact storage and hashed lookups, no per-value Python objects
+        self.values = pd.Index(uniques)
+        self.nulls = np.packbits(self.codes < 0)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.nulls.nbytes + self.values.memory_usage(deep=True)
+
+    def match(self, values):
+        return np.packbits(np.isin(self.codes, _lookup(self.values, values)))
+
+
+def _lookup(index, values):
+    """Positions in index of the values it holds.
+
+    One vectorised scan that hashes only the looked-up values, so unlike
+    get_indexer it leaves no hash table as large as the column behind.
+    """
+    return np.flatnonzero(index.isin(list(values)))
+
+
+class SortedIndex:
+    """Row positions of a numeric or date column in value order, nulls left out"""
+
+    kind = 'sorted'
+
+    def __init__(self, series):
+        values = _comparable(series)
+        present = ~pd.isna(values)
+        positions = np.flatnonzero(present)
+        dtype = np.int32 if len(series) < 2 ** 31 else np.int64
+        values = values[present]
+        order = np.argsort(values, kind='stable')
+        self.rows = len(series)
+        self.order = positions[order].astype(dtype, copy=False)
+        self.sorted = values[order]
+        self.nulls = np.packbits(~present)
+
+    @property
+    def nbytes(self):
+        return self.order.nbytes + self.sorted.nbytes + self.nulls.nbytes
+
+    @property
+    def min(self):
+        return self.sorted[0] if len(self.sorted) else None
+
+    @property
+    def max(self):
+        return self.sorted[-1] if len(self.sorted) else None
+
+    def range(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        """Bitmap of the rows with low <= value <= high; either bound may be open"""
+        start, end = 0, len(self.sorted)
+        if low is not None:
+            start = np.searchsorted(self.sorted, _scalar(low, self.sorted), 'left' if low_inclusive else 'right')
+        if high is not None:
+            end = np.searchsorted(self.sorted, _scalar(high, self.sorted), 'right' if high_inclusive else 'left')
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[self.order[start:max(start, end)]] = True
+        return np.packbits(mask)
+
+    def match(self, values):
+        result = np.zeros_like(self.nulls)
+        for value in values:
+            result |= self.range(value, value)
+        return result
+
+
+def _comparable(series):
+    """Values as a plain numpy array that sorts like the column"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy()
+    return series.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _scalar(value, like):
+    """A query value in the index's own type"""
+    if like.dtype.kind == 'M':
+        value = pd.Timestamp(value)
+        if value.tzinfo is not None:
+            value = value.tz_convert('UTC').tz_localize(None)
+        return value.to_datetime64()
+    return float(value)
+
+
+def build_column_index(series):
+    """The index type that suits a column"""
+    if pd.api.types.is_bool_dtype(series):
+        return BitmapIndex(series)
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return SortedIndex(series)
+    if series.nunique(dropna=True) <= MAX_BITMAP_VALUES:
+        return BitmapIndex(series)
+    return CodeIndex(series)
+
+
+class FrameIndex:
+    """Per-column indexes of a frame, built once, for fast row filtering.
+
+    Categorical columns get bitmaps (or codes past MAX_BITMAP_VALUES) and
+    numeric and date columns a sorted order, so each predicate is a bitmap
+    of matching rows and a compound filter is their bitwise AND.
+    """
+
+    def __init__(self, df):
+        self.rows = len(df)
+        self.names = list(df.columns)
+        self.columns = {}
+        for col in df.columns:
+            try:
+                self.columns[col] = build_column_index(df[col])
+            except TypeError:
+                # Mixed types that cannot be ordered or hashed stay unindexed
+                continue
+
+    def matches(self, df):
+        """Whether this index fits df's rows and columns"""
+        return len(df) == self.rows and list(df.columns) == self.names
+
+    def predicate(self, column, op, value=None):
+        """Packed bitmap of the rows where one predicate holds"""
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        if column not in self.columns:
+            raise KeyError(f"Column is not indexed: {column}")
+        index = self.columns[column]
+        if op == 'is null':
+            return index.nulls.copy()
+        if op == 'not null':
+            return self._invert(index.nulls)
+
+        if op in ('between', '<', '<=', '>', '>=') and index.kind != 'sorted':
+            raise ValueError(f"'{op}' needs a numeric or date column; {column} is categorical")
+        if op == 'between':
+            low, high = value
+            return index.range(low, high)
+        if op in ('<', '<='):
+            return index.range(high=value, high_inclusive=op == '<=')
+        if op in ('>', '>='):
+            return index.range(low=value, low_inclusive=op == '>=')
+
+        values = list(value) if op in ('in', 'not in') else [value]
+        result = index.match(values)
+        if op in ('not in', '!='):
+            # Missing values match neither side of a comparison
+            result = self._invert(result | index.nulls)
+        return result
+
+    def _invert(self, packed):
+        """Flip a packed bitmap, keeping the padding bits clear"""
+        return np.packbits(~np.unpackbits(packed, count=self.rows).astype(bool))
+
+    def mask(self, predicates):
+        """Boolean row mask of rows matching every (column, op, value) predicate"""
+        packed = None
+        for predicate in predicates:
+            bits = self.predicate(*predicate)
+            packed = bits if packed is None else packed & bits
+        if packed is None:
+            return np.ones(self.rows, dtype=bool)
+        return np.unpackbits(packed, count=self.rows).astype(bool)
+
+    def positions(self, predicates):
+        """Row positions matching every predicate, in frame order"""
+        return np.flatnonzero(self.mask(predicates))
+
+    @instrument
+    def select(self, df, predicates):
+        """Rows matching every predicate, copied only when they are scattered.
+
+        No predicates give the frame itself and one contiguous run of rows
+        gives a slice, which shares memory with the frame until written.
+        """
+        if not predicates:
+            return df
+        positions = self.positions(predicates)
+        if len(positions) == self.rows:
+            return df
+        if len(positions) == 0 or positions[-1] - positions[0] + 1 == len(positions):
+            start = positions[0] if len(positions) else 0
+            return df.iloc[start:start + len(positions)]
+        return df.take(positions)
+
+    @property
+    def nbytes(self):
+        """Everything the index keeps alive, values included"""
+        return sum(index.nbytes for index in self.columns.values())
+
+    def describe(self):
+        """One row per column: index type and size"""
+        return pd.DataFrame([{
+            'column': col,
+            'index': index.kind,
+            'values': len(index.values) if hasattr(index, 'values') else None,
+            'bytes': index.nbytes
+        } for col, index in self.columns.items()])
@@ -0,0 +1,100 @@
+"""Pre-aggregate the dashboard feeds into small summary tables.
+
+Each feed's cube is kept next to its summaries, so a rerun only reads the
+rows appended to the CSV since the last run. Run from the data-app folder:
+
+    python export_cubes.py                  # every feed, Parquet
+    python export_cubes.py sales --format csv
+    python export_cubes.py --rebuild        # start again from the first row
+"""
+import argparse
+import time
+from pathlib import Path
+
+from core.cube import SummaryCube
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# The Power BI feeds and the cube each dashboard reads
+FEEDS = {
+    'sales': {
+        'path': REPO_ROOT / 'sale-analysis-db' / 'sales_data.csv',
+        'dimensions': ['Region', 'Product_Category', 'Product_Name'],
+        'measures': {
+            'Quantity': ['sum'],
+            'Sales': ['sum', 'mean'],
+            'Profit': ['sum', 'mean', 'min']
+        },
+        'date_column': 'Order_Date',
+        'date_format': '%d-%m-%Y',
+        'grains': ['month', 'quarter', 'year']
+    },
+    'delivery': {
+        'path': REPO_ROOT / 'delivery-time-analysis-db' / 'zomato_swiggy_delivery_time_10000_rows.csv',
+        'dimensions': ['Platform', 'City', 'Cuisine', 'Delivery_Status'],
+        'measures': {
+            'Order_Value_INR': ['sum', 'mean'],
+            'Delivery_Time_min': ['mean', 'max'],
+            'Delay_min': ['mean', 'max'],
+            'Customer_Rating': ['mean', 'count']
+        },
+        'date_column': 'Order_Date',
+        'date_format': '%d-%m-%Y',
+        'grains': ['month', 'quarter']
+    },
+    'telecom': {
+        'path': REPO_ROOT / 'airtel-jio-performance-db' / 'Airtel_Jio_data.csv',
+        'dimensions': ['Operator', 'Region', 'Plan_Type', 'Network_Type'],
+        'measures': {
+            'Monthly_Charges_INR': ['sum', 'mean'],
+            'Data_Usage_GB': ['sum', 'mean'],
+            'Voice_Minutes': ['sum', 'mean'],
+            'ARPU_INR': ['mean'],
+            'Churn_Flag': ['sum', 'mean']
+        }
+    }
+}
+
+
+def export_feed(name, out_dir=None, file_format='parquet', rebuild=False):
+    """Bring one feed's cube up to date and write its summary tables"""
+    feed = dict(FEEDS[name])
+    path = feed.pop('path')
+    out_dir = Path(out_dir) if out_dir else path.parent / 'summary'
+    out_dir.mkdir(parents=True, exist_ok=True)
+    state_path = out_dir / f"{name}.cube.pkl"
+
+    if state_path.exists() and not rebuild:
+        cube = SummaryCube.load(state_path)
+    else:
+        cube = SummaryCube(**feed)
+
+    start = time.perf_counter()
+    new_rows = cube.update_from_csv(path)
+    paths = cube.export(out_dir, name, file_format)
+    cube.save(state_path)
+    seconds = time.perf_counter() - start
+
+    print(f"{name}: {new_rows:,} new of {cube.rows_seen:,} rows in {seconds:.2f} s")
+    for table_path, table in zip(paths, cube.tables().values()):
+        print(f"  {table_path} ({len(table):,} rows)")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('feeds', nargs='*', help=f"feeds to export: {', '.join(sorted(FEEDS))} (default: all)")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet')
+    parser.add_argument('--out', help="folder for every feed's tables (default: <feed folder>/summary)")
+    parser.add_argument('--rebuild', action='store_true', help='ignore saved cubes and reread every row')
+    args = parser.parse_args()
+    unknown = set(args.feeds) - set(FEEDS)
+    if unknown:
+        parser.error(f"unknown feed: {', '.join(sorted(unknown))}")
+
+    for name in args.feeds or sorted(FEEDS):
+        export_feed(name, args.out, args.format, args.rebuild)
+
+
+if __name__ == '__main__':
+    main()
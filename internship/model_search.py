@@ -0,0 +1,137 @@
+"""Tune and compare the task-6 Titanic models on every core.
+
+Candidates run in a process pool (joblib's loky backend, through n_jobs)
+and share the fitted preprocessing cached by titanic_features, so each CV
+fold's ColumnTransformer is fitted once for all candidates. Successive
+halving scores every candidate on a slice of the rows first and only
+gives the full data to the best third.
+
+Run from the internship folder:
+
+    python model_search.py --baseline
+    python model_search.py --method halving
+"""
+import argparse
+import time
+from pathlib import Path
+
+from titanic_features import CACHE_DIR, load_features, make_pipeline
+
+HERE = Path(__file__).resolve().parent
+
+FEATURES = ["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked", "FamilySize", "IsAlone", "AgeGroup"]
+NUM_COLS = ["Age", "SibSp", "Parch", "Fare", "FamilySize"]
+CAT_COLS = ["Pclass", "Sex", "Embarked", "IsAlone", "AgeGroup"]
+
+# The grid task-6 searches
+RF_GRID = {
+    "clf__n_estimators": [50, 100],
+    "clf__max_depth": [3, 5, 7]
+}
+
+
+def load_task6(path=HERE / 'task-6' / 'titanic.csv'):
+    """Task-6 features and target, with gaps left for the pipeline to impute"""
+    df = load_features(path, age_fill=None, embarked_fill=None, drop_cabin=False)
+    return df[FEATURES], df["Survived"]
+
+
+def candidates():
+    """The task-6 models, each with the grid to tune it over"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    return {
+        "Logistic Regression": (LogisticRegression(max_iter=1000), {"clf__C": [0.1, 1, 10]}),
+        "Random Forest": (RandomForestClassifier(random_state=42), RF_GRID),
+        "Gradient Boosting": (
+            # Stops adding trees once a held-out slice stops improving
+            GradientBoostingClassifier(random_state=42, n_iter_no_change=10),
+            {"clf__learning_rate": [0.05, 0.1], "clf__max_depth": [2, 3]}
+        )
+    }
+
+
+def search(classifier, param_grid, X, y, method='grid', cv=5, n_jobs=-1,
+           cache_dir=CACHE_DIR, scoring="roc_auc", random_state=42):
+    """Fitted grid or successive-halving search over one classifier"""
+    from sklearn.model_selection import GridSearchCV
+
+    pipeline = make_pipeline(classifier, NUM_COLS, CAT_COLS, cache_dir=cache_dir)
+    if method == 'grid':
+        searcher = GridSearchCV(pipeline, param_grid, cv=cv, scoring=scoring, n_jobs=n_jobs)
+    elif method == 'halving':
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        searcher = HalvingGridSearchCV(
+            pipeline, param_grid, cv=cv, scoring=scoring, n_jobs=n_jobs,
+            factor=3, random_state=random_state
+        )
+    else:
+        raise ValueError(f"Unknown search method: {method}")
+    return searcher.fit(X, y)
+
+
+def compare(X_train, y_train, X_test, y_test, method='grid', n_jobs=-1, cache_dir=CACHE_DIR):
+    """Tune every candidate and score its best model on the test split"""
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    rows, models = [], {}
+    for name, (classifier, grid) in candidates().items():
+        start = time.perf_counter()
+        fitted = search(classifier, grid, X_train, y_train, method, n_jobs=n_jobs, cache_dir=cache_dir)
+        seconds = time.perf_counter() - start
+        best = fitted.best_estimator_
+        rows.append({
+            "Model": name,
+            "Best Params": fitted.best_params_,
+            "CV ROC-AUC": fitted.best_score_,
+            "Accuracy": accuracy_score(y_test, best.predict(X_test)),
+            "ROC-AUC": roc_auc_score(y_test, best.predict_proba(X_test)[:, 1]),
+            "Seconds": seconds
+        })
+        models[name] = best
+    return pd.DataFrame(rows), models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--method', choices=['grid', 'halving'], default='grid',
+                        help='halving is faster on big grids but may settle on a different best model')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='worker processes (-1 uses every core)')
+    parser.add_argument('--no-cache', action='store_true', help='refit the preprocessing for every fit')
+    parser.add_argument('--baseline', action='store_true',
+                        help='also time the serial, uncached grid search the notebook used to run')
+    parser.add_argument('--save', help='save the best Random Forest here, e.g. task-6/task6_model.joblib')
+    args = parser.parse_args()
+
+    from sklearn.model_selection import train_test_split
+    X, y = load_task6()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    cache_dir = None if args.no_cache else CACHE_DIR
+
+    results, models = compare(X_train, y_train, X_test, y_test, args.method, args.n_jobs, cache_dir)
+    print(results.to_string(index=False))
+    print(f"\nTotal search time: {results['Seconds'].sum():.2f} s ({args.method}, n_jobs={args.n_jobs})")
+
+    if args.baseline:
+        from sklearn.ensemble import RandomForestClassifier
+        start = time.perf_counter()
+        serial = search(RandomForestClassifier(random_state=42), RF_GRID, X_train, y_train,
+                        'grid', n_jobs=None, cache_dir=None)
+        seconds = time.perf_counter() - start
+        tuned = results.set_index("Model").loc["Random Forest"]
+        print(f"Serial uncached Random Forest grid: {seconds:.2f} s, best {serial.best_params_}; "
+              f"this run: {tuned['Seconds']:.2f} s, best {tuned['Best Params']}")
+
+    if args.save:
+        import joblib
+        joblib.dump(models["Random Forest"], args.save)
+        print(f"Saved the tuned Random Forest to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
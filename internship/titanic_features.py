@@ -0,0 +1,175 @@
+"""Shared Titanic feature engineering for the internship tasks.
+
+Every task cleans the same titanic.csv, so the cleaning and the derived
+columns live here and are cached on disk. A notebook inside task-N uses:
+
+    import sys
+    sys.path.append('..')
+    from titanic_features import load_features
+
+    df = load_features('titanic.csv', age_fill='mean')
+
+Engineered frames are cached by the hash of the input file and the
+parameters, so changing either one rebuilds the cache entry. Model
+pipelines from make_pipeline() cache their fitted preprocessing as well.
+"""
+import hashlib
+import json
+import pickle
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parent / '.feature_cache'
+
+AGE_BINS = [0, 12, 18, 35, 60, 100]
+AGE_LABELS = ['Child', 'Teen', 'Adult', 'MidAge', 'Senior']
+
+NUM_COLS = ['Age', 'SibSp', 'Parch', 'Fare', 'FamilySize']
+CAT_COLS = ['Pclass', 'Sex', 'Embarked', 'IsAlone', 'AgeGroup']
+
+DEFAULTS = {
+    'age_fill': 'median',        # 'median', 'mean' or None to keep the gaps
+    'embarked_fill': 'mode',     # 'mode' or None
+    'drop_cabin': True,
+    'family_features': True,     # add FamilySize and IsAlone
+    'family_size_offset': 0,     # 1 counts the passenger in FamilySize
+    'family_size_name': 'FamilySize',
+    'is_alone': True,            # False adds FamilySize only
+    'age_bins': AGE_BINS,        # None skips AgeGroup
+    'age_labels': AGE_LABELS
+}
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+def engineer_features(df, **params):
+    """Clean a raw Titanic frame and add the derived columns"""
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise TypeError(f"Unknown feature parameters: {', '.join(sorted(unknown))}")
+    params = {**DEFAULTS, **params}
+    df = df.copy()
+
+    if params['age_fill'] == 'median':
+        df['Age'] = df['Age'].fillna(df['Age'].median())
+    elif params['age_fill'] == 'mean':
+        df['Age'] = df['Age'].fillna(df['Age'].mean())
+    elif params['age_fill'] is not None:
+        raise ValueError(f"Unknown age_fill: {params['age_fill']}")
+
+    if params['embarked_fill'] == 'mode':
+        df['Embarked'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
+    elif params['embarked_fill'] is not None:
+        raise ValueError(f"Unknown embarked_fill: {params['embarked_fill']}")
+
+    if params['drop_cabin'] and 'Cabin' in df.columns:
+        df = df.drop(columns=['Cabin'])
+
+    if params['family_features']:
+        relatives = df['SibSp'] + df['Parch']
+        df[params['family_size_name']] = relatives + params['family_size_offset']
+        if params['is_alone']:
+            df['IsAlone'] = (relatives == 0).astype(int)
+
+    if params['age_bins'] is not None:
+        df['AgeGroup'] = pd.cut(df['Age'], bins=params['age_bins'], labels=params['age_labels'])
+    return df
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(path, **params):
+    """Key of the cache entry for a file and a set of parameters"""
+    params = {**DEFAULTS, **params}
+    payload = json.dumps({'file': file_hash(path), 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _read_cache(path):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _write_cache(df, path):
+    # Write then rename, so an interrupted run never leaves a broken entry
+    partial = path.with_name(path.name + '.partial')
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(partial, index=False)
+    else:
+        with open(partial, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    partial.replace(path)
+
+
+def load_features(path='titanic.csv', cache_dir=CACHE_DIR, refresh=False, **params):
+    """Engineered features for a Titanic CSV, read from the cache when possible"""
+    cache_dir = Path(cache_dir)
+    suffix = '.parquet' if CACHE_FORMAT == 'parquet' else '.pkl'
+    entry = cache_dir / f"features-{cache_key(path, **params)}{suffix}"
+
+    if entry.exists() and not refresh:
+        return _read_cache(entry)
+
+    df = engineer_features(pd.read_csv(path), **params)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_cache(df, entry)
+    return df
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Delete every cached feature frame and fitted preprocessor"""
+    import shutil
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def build_preprocessor(num_cols=NUM_COLS, cat_cols=CAT_COLS):
+    """Impute, scale and one-hot encode the model inputs"""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    num_pipeline = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', StandardScaler())
+    ])
+    cat_pipeline = Pipeline([
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('encoder', OneHotEncoder(handle_unknown='ignore'))
+    ])
+    return ColumnTransformer([
+        ('num', num_pipeline, list(num_cols)),
+        ('cat', cat_pipeline, list(cat_cols))
+    ])
+
+
+def make_pipeline(classifier, num_cols=NUM_COLS, cat_cols=CAT_COLS,
+                  step_names=('prep', 'clf'), cache_dir=CACHE_DIR):
+    """Preprocessing plus classifier, with the fitted preprocessing cached on disk.
+
+    Refitting on the same rows, as cross-validation and grid searches do for
+    every candidate, loads the fitted ColumnTransformer from the cache.
+    Pass cache_dir=None to turn the cache off.
+    """
+    from sklearn.pipeline import Pipeline
+
+    memory = str(Path(cache_dir) / 'sklearn') if cache_dir is not None else None
+    prep_name, clf_name = step_names
+    return Pipeline([
+        (prep_name, build_preprocessor(num_cols, cat_cols)),
+        (clf_name, classifier)
+    ], memory=memory)
@@ -0,0 +1,435 @@
+"""Serve the repo's saved models for local batch scoring.
+
+    python serve.py --port 8500
+    curl -X POST -H 'Content-Type: text/csv' --data-binary @passengers.csv \\
+         http://127.0.0.1:8500/predict/titanic-task5
+    curl http://127.0.0.1:8500/stats
+
+    python serve.py bench --model titanic-task6 --rows 200000 --clients 8
+
+Every model is loaded once at startup, with its arrays memory-mapped where
+the file allows it. Requests that arrive together for the same model are
+merged into one predict call, so scoring many small batches costs about
+as much as scoring one large frame.
+"""
+import argparse
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(REPO_ROOT / 'internship'))
+
+MAX_BATCH_ROWS = 8192
+MAX_WAIT_MS = 5.0
+
+
+def _titanic_task6(df):
+    """Derive FamilySize, IsAlone and AgeGroup for the task-6 model"""
+    if 'FamilySize' in df.columns:
+        return df
+    from titanic_features import engineer_features
+    return engineer_features(df, age_fill=None, embarked_fill=None, drop_cabin=False)
+
+
+MODELS = {
+    'titanic-task5': {
+        'path': REPO_ROOT / 'internship' / 'task-5' / 'model.joblib',
+        'sample': REPO_ROOT / 'internship' / 'task-5' / 'titanic.csv'
+    },
+    'titanic-task6': {
+        'path': REPO_ROOT / 'internship' / 'task-6' / 'task6_model.joblib',
+        'prepare': _titanic_task6,
+        'sample': REPO_ROOT / 'internship' / 'task-6' / 'titanic.csv'
+    },
+    # Bundle written by house-price-prediction/house_price.py
+    'house-price': {
+        'path': REPO_ROOT / 'house-price-prediction' / 'house_price_model.joblib'
+    }
+}
+
+
+class LoadedModel:
+    """A saved model, loaded once and scored a whole frame at a time"""
+
+    def __init__(self, path, prepare=None, mmap=True):
+        import joblib
+        # Memory-mapping only applies to uncompressed files; joblib warns and
+        # loads compressed ones fully, which serving should not hide
+        loaded = joblib.load(path, mmap_mode='r' if mmap else None)
+        # Bundles carry the model together with its input columns
+        self.bundle = loaded if isinstance(loaded, dict) and 'model' in loaded else None
+        self.model = self.bundle['model'] if self.bundle else loaded
+        self.prepare = prepare
+        self.is_classifier = hasattr(self.model, 'predict_proba')
+
+    def features(self):
+        """Input columns the model expects, when it recorded them"""
+        if self.bundle and self.bundle.get('features'):
+            return list(self.bundle['features'])
+        names = getattr(self.model, 'feature_names_in_', None)
+        return list(names) if names is not None else None
+
+    def prepare_frame(self, df):
+        """Derive any extra inputs and keep the model's columns, in its order.
+
+        Raises KeyError naming the missing columns, so a bad request fails on
+        its own instead of being NaN-filled inside someone else's batch.
+        """
+        if self.prepare is not None:
+            df = self.prepare(df)
+        features = self.features()
+        if features is None:
+            return df
+        missing = [col for col in features if col not in df.columns]
+        if missing:
+            raise KeyError(f"Missing input columns: {', '.join(map(str, missing))}")
+        return df[features]
+
+    def predict(self, df):
+        """Predictions, and probabilities for classifiers, as arrays aligned with df"""
+        return self.score(self.prepare_frame(df))
+
+    def score(self, X):
+        """Predict on a frame already passed through prepare_frame()"""
+        if not self.is_classifier:
+            return {'prediction': np.asarray(self.model.predict(X))}
+        # One vectorised call gives both the labels and the probabilities
+        proba = self.model.predict_proba(X)
+        labels = np.asarray(self.model.classes_)[proba.argmax(axis=1)]
+        probability = proba[:, 1] if proba.shape[1] == 2 else proba.max(axis=1)
+        return {'prediction': labels, 'probability': probability}
+
+
+class LatencyStats:
+    """Request latency percentiles and throughput over a sliding window"""
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.recent = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._lock = threading.Lock()
+
+    def record_request(self, seconds, rows):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.recent.append((time.perf_counter(), rows))
+            self.requests += 1
+            self.rows += rows
+
+    def record_batch(self, requests):
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += requests
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.asarray(self.latencies)
+            recent = list(self.recent)
+            snapshot = {
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'requests_per_batch': self.batched_requests / self.batches if self.batches else None
+            }
+        if len(latencies):
+            snapshot['p50_ms'] = float(np.percentile(latencies, 50) * 1000)
+            snapshot['p99_ms'] = float(np.percentile(latencies, 99) * 1000)
+        if len(recent) > 1:
+            span = recent[-1][0] - recent[0][0]
+            rows = sum(r for _, r in recent[1:])
+            snapshot['rows_per_second'] = rows / span if span > 0 else None
+        return snapshot
+
+
+class MicroBatcher:
+    """Merge concurrent requests for one model into single predict calls.
+
+    A worker thread takes the first waiting request, then keeps collecting
+    for up to max_wait_ms or until max_rows rows are queued, and scores them
+    all as one frame.
+    """
+
+    def __init__(self, model, stats, max_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.stats = stats
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, df):
+        """Queue a frame for scoring; the future resolves to its predictions.
+
+        The frame is checked against the model's inputs first, and a request
+        with missing columns is rejected here rather than queued.
+        """
+        future = Future()
+        try:
+            df = self.model.prepare_frame(df)
+        except Exception as error:
+            future.set_exception(error)
+            return future
+        self.queue.put((df, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self.queue.get()]
+            rows = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_rows:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+            # Only frames with the same columns are stacked, so concat never
+            # fills a column one request lacks with NaN
+            groups = {}
+            for item in pending:
+                groups.setdefault(tuple(item[0].columns), []).append(item)
+            for group in groups.values():
+                self._score(group)
+
+    def _score(self, pending):
+        frames = [df for df, _ in pending]
+        try:
+            batch = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            outputs = self.model.score(batch)
+        except Exception as error:
+            if len(pending) == 1:
+                pending[0][1].set_exception(error)
+                return
+            # Score one by one so a malformed request only fails itself
+            for item in pending:
+                self._score([item])
+            return
+
+        self.stats.record_batch(len(pending))
+        start = 0
+        for df, future in pending:
+            end = start + len(df)
+            future.set_result({key: values[start:end] for key, values in outputs.items()})
+            start = end
+
+
+class InferenceService:
+    """Loaded models, each behind its own micro-batcher"""
+
+    def __init__(self, names=None, max_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS, mmap=True):
+        self.models = {}
+        self.batchers = {}
+        self.stats = {}
+        self.skipped = {}
+        for name in names or MODELS:
+            spec = MODELS[name]
+            if not Path(spec['path']).exists():
+                self.skipped[name] = f"{spec['path']} not found"
+                continue
+            model = LoadedModel(spec['path'], spec.get('prepare'), mmap)
+            self.models[name] = model
+            self.stats[name] = LatencyStats()
+            self.batchers[name] = MicroBatcher(model, self.stats[name], max_rows, max_wait_ms)
+
+    def predict(self, name, df):
+        """Score a frame with one model, waiting for its micro-batch"""
+        if name not in self.batchers:
+            raise KeyError(name)
+        start = time.perf_counter()
+        outputs = self.batchers[name].submit(df).result()
+        self.stats[name].record_request(time.perf_counter() - start, len(df))
+        return outputs
+
+    def describe(self):
+        return {
+            'models': {
+                name: {
+                    'classifier': model.is_classifier,
+                    'features': model.features()
+                }
+                for name, model in self.models.items()
+            },
+            'skipped': self.skipped
+        }
+
+
+def read_frame(body, content_type):
+    """Parse a CSV body, or a JSON list of records / {"columns", "data"} body"""
+    if 'csv' in content_type:
+        return pd.read_csv(io.BytesIO(body))
+    payload = json.loads(body or b'[]')
+    if isinstance(payload, dict) and 'data' in payload:
+        return pd.DataFrame(payload['data'], columns=payload.get('columns'))
+    if isinstance(payload, dict):
+        payload = payload.get('rows', [payload])
+    return pd.DataFrame.from_records(payload)
+
+
+def make_handler(service):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/models':
+                self._send_json(200, service.describe())
+            elif self.path == '/stats':
+                self._send_json(200, {name: stats.snapshot() for name, stats in service.stats.items()})
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            if not self.path.startswith('/predict/'):
+                self.send_error(404)
+                return
+            name = self.path[len('/predict/'):]
+            if name not in service.models:
+                self._send_json(404, {'error': f"Unknown model: {name}"})
+                return
+
+            content_type = self.headers.get('Content-Type', 'application/json')
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                df = read_frame(body, content_type)
+                outputs = service.predict(name, df)
+            except Exception as error:
+                self._send_json(400, {'error': f"{type(error).__name__}: {error}"})
+                return
+
+            if 'csv' in content_type:
+                # CSV in, CSV out keeps large batches cheap to produce
+                self._send(200, pd.DataFrame(outputs).to_csv(index=False).encode('utf-8'), 'text/csv')
+            else:
+                self._send_json(200, {key: values.tolist() for key, values in outputs.items()})
+
+        def _send_json(self, status, payload):
+            self._send(status, json.dumps(payload).encode('utf-8'), 'application/json')
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return InferenceHandler
+
+
+def serve(args):
+    service = InferenceService(args.models, args.max_batch_rows, args.max_wait_ms, not args.no_mmap)
+    for name, reason in service.skipped.items():
+        print(f"Skipping {name}: {reason}")
+    if not service.models:
+        print("No models to serve")
+        return 1
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving {', '.join(service.models)} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def bench(args):
+    """Score rows from concurrent in-process clients and report latency"""
+    service = InferenceService([args.model], args.max_batch_rows, args.max_wait_ms, not args.no_mmap)
+    if args.model not in service.models:
+        print(f"Cannot load {args.model}: {service.skipped.get(args.model)}")
+        return 1
+
+    sample_path = args.data or MODELS[args.model].get('sample')
+    if sample_path is None:
+        print("Pass --data with a CSV of input rows for this model")
+        return 1
+    sample = pd.read_csv(sample_path)
+    requests_per_client = max(1, args.rows // (args.clients * args.request_rows))
+
+    errors = []
+
+    def client(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(requests_per_client):
+            rows = rng.integers(0, len(sample), args.request_rows)
+            try:
+                service.predict(args.model, sample.iloc[rows].reset_index(drop=True))
+            except Exception as error:
+                errors.append(f"{type(error).__name__}: {error}")
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    stats = service.stats[args.model].snapshot()
+    if errors:
+        print(f"{len(errors):,} of {requests_per_client * args.clients:,} requests failed:")
+        for message, count in pd.Series(errors).value_counts().head(5).items():
+            print(f"  {count:,} x {message}")
+    if not stats['requests']:
+        return 1
+    print(f"{args.model}: {stats['rows']:,} rows in {stats['requests']:,} requests from "
+          f"{args.clients} clients, {seconds:.2f} s")
+    print(f"  latency p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms")
+    print(f"  throughput {stats['rows'] / seconds:,.0f} rows/s, "
+          f"{stats['requests_per_batch']:.1f} requests per predict call")
+    return 0
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--max-batch-rows', type=int, default=MAX_BATCH_ROWS)
+    common.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS,
+                        help='how long a request may wait for others to share its predict call')
+    common.add_argument('--no-mmap', action='store_true', help='load model arrays into memory')
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command')
+
+    serve_parser = commands.add_parser('serve', parents=[common], help='run the HTTP service (default)')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8500)
+    serve_parser.add_argument('--models', nargs='+', choices=sorted(MODELS), help='only load these models')
+    serve_parser.set_defaults(func=serve)
+
+    bench_parser = commands.add_parser('bench', parents=[common], help='measure latency and throughput in-process')
+    bench_parser.add_argument('--model', required=True, choices=sorted(MODELS))
+    bench_parser.add_argument('--data', help='CSV of input rows (default: the model\'s training CSV)')
+    bench_parser.add_argument('--rows', type=int, default=100_000)
+    bench_parser.add_argument('--clients', type=int, default=8)
+    bench_parser.add_argument('--request-rows', type=int, default=100)
+    bench_parser.set_defaults(func=bench)
+
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ('serve', 'bench', '-h', '--help'):
+        argv = ['serve'] + argv
+    args = parser.parse_args(argv)
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Run the student performance report over many class files at once.
+
+The analysis is the one analysis.py does for data.csv, driven by a config
+so other layouts work too. Charts are drawn off-screen into one PDF per
+file, and every file's figures land in one summary table.
+
+    python report_engine.py data.csv
+    python report_engine.py classes/ --config report_config.json --out reports --workers 8
+
+Config (JSON, every key optional):
+
+    {
+        "score_columns": ["Math", "Science", "English"],
+        "group_keys": ["Gender"],
+        "derived": {"Total": ["Math", "Science", "English"]},
+        "name_column": "Name",
+        "sep": ","
+    }
+
+Each derived column is the row-wise sum of the columns listed for it.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+import pandas as pd
+
+DEFAULT_CONFIG = {
+    'score_columns': ['Math', 'Science', 'English'],
+    'group_keys': ['Gender'],
+    'derived': {'Total': ['Math', 'Science', 'English']},
+    'name_column': 'Name',
+    'sep': ','
+}
+
+# Charts with one bar or point per student stop being readable past this
+MAX_STUDENT_CHART_ROWS = 60
+SUBJECT_COLORS = ["#f4a261", "#2a9d8f", "#e76f51"]
+
+
+def load_config(path=None):
+    """Defaults overridden by a JSON config file"""
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        config.update(json.loads(Path(path).read_text()))
+    return config
+
+
+def analyze(df, config):
+    """Derived columns, per-group averages and summary rows for one class"""
+    scores = list(config['score_columns'])
+    for name, parts in config['derived'].items():
+        df[name] = df[parts].sum(axis=1)
+    measures = scores + [name for name in config['derived'] if name not in scores]
+
+    overall = {'group_key': 'All', 'group': 'All', 'students': len(df)}
+    overall.update({f'{col}_mean': df[col].mean() for col in measures})
+    rank_by = measures[-1]
+    name_col = config.get('name_column')
+    if len(df) and name_col in df.columns:
+        top = df.loc[df[rank_by].idxmax()]
+        overall['topper'] = top[name_col]
+        overall[f'topper_{rank_by}'] = top[rank_by]
+
+    rows, groups = [overall], {}
+    for key in config['group_keys']:
+        if key not in df.columns:
+            continue
+        # One grouped pass gives every count and mean for this key
+        table = df.groupby(key, observed=True)[measures].agg(['count', 'mean'])
+        averages = table.xs('mean', axis=1, level=1)
+        groups[key] = averages
+        for group, values in averages.iterrows():
+            row = {'group_key': key, 'group': group, 'students': int(table.loc[group, (measures[0], 'count')])}
+            row.update({f'{col}_mean': values[col] for col in measures})
+            rows.append(row)
+    return df, groups, rows, measures
+
+
+def render_report(df, groups, config, measures, path):
+    """Draw the analysis.py charts for one class into a single PDF"""
+    scores = list(config['score_columns'])
+    total = measures[-1]
+    name_col = config.get('name_column')
+    students = df.head(MAX_STUDENT_CHART_ROWS)
+    labels = students[name_col] if name_col in students.columns else students.index.astype(str)
+
+    with PdfPages(path) as pdf:
+        # Bar chart - Total marks by student
+        fig, ax = plt.subplots(figsize=(8, 5))
+        ax.bar(labels, students[total], color="skyblue")
+        ax.set_title(f"{total} Marks by Student")
+        ax.set_xlabel("Student Name")
+        ax.set_ylabel(f"{total} Marks")
+        ax.grid(axis="y", linestyle="--", alpha=0.7)
+        ax.tick_params(axis='x', labelrotation=90 if len(students) > 15 else 0)
+        fig.tight_layout()
+        pdf.savefig(fig)
+        plt.close(fig)
+
+        # Line chart - Subject comparison
+        fig, ax = plt.subplots(figsize=(8, 5))
+        for col in scores:
+            ax.plot(labels, students[col], marker="o", label=col)
+        ax.set_title("Subject-wise Performance")
+        ax.set_xlabel("Student Name")
+        ax.set_ylabel("Marks")
+        ax.legend()
+        ax.grid(True, linestyle="--", alpha=0.7)
+        ax.tick_params(axis='x', labelrotation=90 if len(students) > 15 else 0)
+        fig.tight_layout()
+        pdf.savefig(fig)
+        plt.close(fig)
+
+        for key, averages in groups.items():
+            # Pie Chart - Average total marks by group
+            fig, ax = plt.subplots(figsize=(5, 5))
+            ax.pie(averages[total], labels=averages.index.astype(str), autopct="%1.1f%%", startangle=90)
+            ax.set_title(f"Average {total} Marks by {key}")
+            fig.tight_layout()
+            pdf.savefig(fig)
+            plt.close(fig)
+
+            # Bar Chart - Subject comparison by group
+            fig, ax = plt.subplots(figsize=(7, 5))
+            colors = SUBJECT_COLORS[:len(scores)] if len(scores) <= len(SUBJECT_COLORS) else None
+            averages[scores].plot(kind="bar", ax=ax, color=colors)
+            ax.set_title(f"Average Subject Marks by {key}")
+            ax.set_xlabel(key)
+            ax.set_ylabel("Average Marks")
+            ax.grid(axis="y", linestyle="--", alpha=0.7)
+            fig.tight_layout()
+            pdf.savefig(fig)
+            plt.close(fig)
+
+
+def report_file(path, config, out_dir, charts=True, name=None):
+    """Analyze one class file and write its PDF (named name, default the file's stem); returns its summary rows"""
+    path = Path(path)
+    report = Path(out_dir) / f"{name or path.stem}.pdf"
+    try:
+        df = pd.read_csv(path, sep=config.get('sep', ','))
+        df, groups, rows, measures = analyze(df, config)
+        if charts:
+            render_report(df, groups, config, measures, report)
+    except Exception as error:
+        return [{'file': str(path), 'error': f"{type(error).__name__}: {error}"}]
+    return [{'file': str(path), 'report': report.name if charts else None, **row} for row in rows]
+
+
+def collect_files(paths):
+    """CSV files from a mix of file and folder arguments"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('*.csv')) if path.is_dir() else [path])
+    return files
+
+
+def report_names(files):
+    """PDF names for the files, numbered where two share a name so neither overwrites the other"""
+    used, names = set(), []
+    for path in map(Path, files):
+        name, n = path.stem, 2
+        # Case-insensitive, as the output folder may be; a number can collide
+        # with another file's own name, so count up until the name is free
+        while name.casefold() in used:
+            name = f"{path.stem} ({n})"
+            n += 1
+        used.add(name.casefold())
+        names.append(name)
+    return names
+
+
+def run(files, config, out_dir, workers=None, charts=True):
+    """Report on every file across worker processes and return the combined summary"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    names = report_names(files)
+
+    rows = []
+    if workers == 1 or len(files) == 1:
+        for path, name in zip(files, names):
+            rows.extend(report_file(path, config, out_dir, charts, name))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(files) // (workers * 4))
+            for file_rows in pool.map(report_file, files, [config] * len(files),
+                                      [out_dir] * len(files), [charts] * len(files), names,
+                                      chunksize=chunksize):
+                rows.extend(file_rows)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='class CSV files or folders of them')
+    parser.add_argument('--config', help='JSON config (default: the data.csv layout)')
+    parser.add_argument('--out', default='reports', help='folder for the PDFs and summary.csv')
+    parser.add_argument('--workers', type=int, default=None, help='processes to use (default: every core)')
+    parser.add_argument('--no-charts', action='store_true', help='only write the summary table')
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    summary = run(files, load_config(args.config), args.out, args.workers, not args.no_charts)
+    summary_path = Path(args.out) / 'summary.csv'
+    summary.to_csv(summary_path, index=False)
+
+    failed = summary['error'].notna().sum() if 'error' in summary.columns else 0
+    print(f"Reported on {len(files) - failed} of {len(files)} file(s); summary saved as '{summary_path}'")
+    if failed:
+        print(summary.loc[summary['error'].notna(), ['file', 'error']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()